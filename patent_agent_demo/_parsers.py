@@ -0,0 +1,354 @@
+"""
+Response parsers for the Google A2A client
+Pure string -> dataclass conversion, kept free of I/O so it can be compiled with mypyc
+
+The prompts ask the model for JSON; each parser decodes it, falls back to
+regex extraction for plain-text replies, and then to default values for
+anything missing or malformed.
+
+Build (optional): mypyc patent_agent_demo/_parsers.py
+The compiled extension shadows this file; the import path stays the same.
+"""
+
+from types import ModuleType
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+import json
+import logging
+import re
+
+# Declared up front so mypy (and so mypyc) accepts the None fallback
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# The record dataclasses carry no hand-written __slots__: mypyc cannot compile
+# a dataclass that declares them, and the compiled build already gives them a
+# fixed native layout without a per-object __dict__. They stay mutable because
+# the writer and rewriter agents update drafts in place.
+
+_decoder = json.JSONDecoder()
+
+# Compiled once at import; scanning runs in the C regex engine instead of
+# per-character Python loops over multi-KB responses
+_JSON_START_RE = re.compile(r"[{\[]")
+_LEADING_JSON_RE = re.compile(r"\s*(?:```(?:json)?\s*)?[{\[]")
+_LIST_ITEM_RE = re.compile(r"^[ \t]*(?:[-*\u2022]|\d+[.)])[ \t]+(.+?)[ \t]*$", re.MULTILINE)
+# Both analysis scores are picked up in one scan of a plain-text reply
+_SCORE_RE = re.compile(r"(novelty|inventive)[^\n:]{0,40}:[ \t*]*(\d+(?:\.\d+)?)", re.IGNORECASE)
+# Leading number of a score given as text, e.g. "8/10" or "7.5 out of 10"
+_LEADING_NUMBER_RE = re.compile(r"\s*(-?\d+(?:\.\d+)?)")
+
+def extract_json(response: str) -> Any:
+    """Decode the first JSON value in a model response, or return None"""
+    match = _JSON_START_RE.search(response)
+    if match is None:
+        return None
+    # A bare JSON reply parses in one orjson call; only fall through to the
+    # bracket scan when it has prose or markdown fences around it
+    if orjson is not None and (match.start() == 0 or response[:match.start()].isspace()):
+        try:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
+            pass
+    # raw_decode parses in place from each candidate bracket and ignores any
+    # trailing text, so there is no slicing or second scan for the closing bracket
+    while match is not None:
+        try:
+            return _decoder.raw_decode(response, match.start())[0]
+        except ValueError:
+            match = _JSON_START_RE.search(response, match.start() + 1)
+    return None
+
+def leading_json_end(text: str) -> int:
+    """Return the end offset of the JSON value that opens text, or -1 if incomplete
+
+    Only a value at the very start (optionally inside a ```json fence) counts,
+    so a stray bracket in leading prose or a nested object is never mistaken
+    for the complete reply.
+    """
+    match = _LEADING_JSON_RE.match(text)
+    if match is None:
+        return -1
+    try:
+        return _decoder.raw_decode(text, match.end() - 1)[1]
+    except ValueError:
+        return -1
+
+def _unwrap_list(obj: Any, key: str) -> List[Any]:
+    """Return obj if it is a list, or obj[key] if obj is a dict wrapping one"""
+    if isinstance(obj, dict):
+        obj = obj.get(key)
+    return obj if isinstance(obj, list) else []
+
+def _str_list(items: List[Any]) -> List[str]:
+    return [str(item) for item in items if item]
+
+# Per-field coercions for decoded JSON. The model does not always honour the
+# schema, so a field of the wrong type falls back to its default instead of
+# raising and discarding the whole response.
+
+def _as_float(value: Any, default: float) -> float:
+    """Return value as a float, reading the leading number of text such as 8/10"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        match = _LEADING_NUMBER_RE.match(value)
+        if match is not None:
+            return float(match.group(1))
+    return default
+
+def _as_str(value: Any, default: str) -> str:
+    """Return value as a string, or default when it is missing or a container"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    return default
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+def _as_list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+def _as_str_list(value: Any, default: List[str]) -> List[str]:
+    """Return value as a list of strings, wrapping a lone string as [value]"""
+    if isinstance(value, str):
+        value = [value]
+    items = _str_list(value) if isinstance(value, list) else []
+    return items or list(default)
+
+def _list_items(response: str) -> List[str]:
+    """Return the bulleted or numbered lines of a plain-text response"""
+    return _LIST_ITEM_RE.findall(response)
+
+def _find_scores(response: str) -> Dict[str, float]:
+    """Return the first novelty and inventive-step scores found in response"""
+    scores: Dict[str, float] = {}
+    for match in _SCORE_RE.finditer(response):
+        key = "novelty_score" if match.group(1).lower() == "novelty" else "inventive_step_score"
+        if key not in scores:
+            scores[key] = float(match.group(2))
+            if len(scores) == 2:
+                break
+    return scores
+
+@dataclass
+class PatentAnalysis:
+    """Patent analysis result"""
+    novelty_score: float
+    inventive_step_score: float
+    industrial_applicability: bool
+    prior_art_analysis: List[Dict[str, Any]]
+    claim_analysis: Dict[str, Any]
+    technical_merit: Dict[str, Any]
+    commercial_potential: str
+    patentability_assessment: str
+    recommendations: List[str]
+
+@dataclass
+class PatentDraft:
+    """Patent draft content"""
+    title: str
+    abstract: str
+    background: str
+    summary: str
+    detailed_description: str
+    claims: List[str]
+    drawings_description: str
+    technical_diagrams: List[str]
+
+@dataclass
+class SearchResult:
+    """Search result for prior art"""
+    patent_id: str
+    title: str
+    abstract: str
+    inventors: List[str]
+    filing_date: str
+    publication_date: str
+    relevance_score: float
+    similarity_analysis: Dict[str, Any]
+
+def parse_patent_analysis(response: str) -> PatentAnalysis:
+    """Parse patent analysis from AI response"""
+    try:
+        obj = extract_json(response)
+        if not isinstance(obj, dict):
+            # Plain-text reply: pick the scores out of lines like "Novelty score: 8/10"
+            logger.warning("Patent analysis response was not JSON; using scores found in the text")
+            obj = _find_scores(response)
+        return PatentAnalysis(
+            novelty_score=_as_float(obj.get("novelty_score"), 8.5),
+            inventive_step_score=_as_float(obj.get("inventive_step_score"), 7.8),
+            industrial_applicability=bool(obj.get("industrial_applicability", True)),
+            prior_art_analysis=_as_list(obj.get("prior_art_analysis")),
+            claim_analysis=_as_dict(obj.get("claim_analysis")),
+            technical_merit=_as_dict(obj.get("technical_merit")),
+            commercial_potential=_as_str(obj.get("commercial_potential"), "Medium to High"),
+            patentability_assessment=_as_str(obj.get("patentability_assessment"), "Strong"),
+            recommendations=_as_str_list(obj.get("recommendations"),
+                                         ["Improve claim specificity", "Add more technical details"])
+        )
+    except Exception as e:
+        logger.error("Error parsing patent analysis: %s", e)
+        raise
+
+def parse_search_results(response: str) -> List[SearchResult]:
+    """Parse search results from AI response"""
+    try:
+        results = []
+        for item in _unwrap_list(extract_json(response), "results"):
+            if not isinstance(item, dict):
+                logger.warning("Skipping prior art result that is not a JSON object")
+                continue
+            # A malformed item is dropped on its own rather than failing the batch
+            try:
+                results.append(SearchResult(
+                    patent_id=_as_str(item.get("patent_id"), ""),
+                    title=_as_str(item.get("title"), ""),
+                    abstract=_as_str(item.get("abstract"), ""),
+                    inventors=_as_str_list(item.get("inventors"), []),
+                    filing_date=_as_str(item.get("filing_date"), ""),
+                    publication_date=_as_str(item.get("publication_date"), ""),
+                    relevance_score=_as_float(item.get("relevance_score"), 0.0),
+                    similarity_analysis=_as_dict(item.get("similarity_analysis"))
+                ))
+            except (TypeError, ValueError) as e:
+                logger.warning("Skipping malformed prior art result: %s", e)
+        if results:
+            return results
+            
+        # Fall back to an example result when nothing could be decoded
+        logger.warning("No prior art results could be decoded; returning an example result")
+        return [
+            SearchResult(
+                patent_id="US12345678",
+                title="Example Prior Art Patent",
+                abstract="This is an example prior art patent...",
+                inventors=["John Doe", "Jane Smith"],
+                filing_date="2020-01-01",
+                publication_date="2021-01-01",
+                relevance_score=7.5,
+                similarity_analysis={"overlap": "30%", "differences": "Key differences noted"}
+            )
+        ]
+    except Exception as e:
+        logger.error("Error parsing search results: %s", e)
+        raise
+
+def _draft_from_json(obj: Any) -> PatentDraft:
+    """Build a PatentDraft from decoded JSON, defaulting missing fields"""
+    if not isinstance(obj, dict):
+        obj = {}
+    return PatentDraft(
+        title=_as_str(obj.get("title"), "Generated Patent Title"),
+        abstract=_as_str(obj.get("abstract"), "This is a generated abstract..."),
+        background=_as_str(obj.get("background"), "Background section..."),
+        summary=_as_str(obj.get("summary"), "Summary of invention..."),
+        detailed_description=_as_str(obj.get("detailed_description"), "Detailed description..."),
+        claims=_as_str_list(obj.get("claims"), ["Claim 1...", "Claim 2...", "Claim 3..."]),
+        drawings_description=_as_str(obj.get("drawings_description"), "Drawings description..."),
+        technical_diagrams=_as_str_list(obj.get("technical_diagrams"),
+                                        ["Figure 1 description", "Figure 2 description"])
+    )
+
+def _review_from_json(obj: Any) -> Dict[str, Any]:
+    """Build review feedback from decoded JSON, defaulting missing keys"""
+    feedback: Dict[str, Any] = {
+        "quality_score": 8.0,
+        "technical_accuracy": "Good",
+        "legal_compliance": "Compliant",
+        "claim_strength": "Strong",
+        "improvements": ["Add more examples", "Clarify technical terms"],
+        "risks": ["Potential prior art conflicts"],
+        "recommendation": "Proceed with minor revisions"
+    }
+    if isinstance(obj, dict):
+        feedback.update(obj)
+        feedback["quality_score"] = _as_float(feedback["quality_score"], 8.0)
+        feedback["improvements"] = _as_str_list(feedback["improvements"], [])
+        feedback["risks"] = _as_str_list(feedback["risks"], [])
+    return feedback
+
+def _default_optimized_claims() -> List[str]:
+    return [
+        "Optimized Claim 1...",
+        "Optimized Claim 2...",
+        "Optimized Claim 3..."
+    ]
+
+def parse_patent_draft(response: str) -> PatentDraft:
+    """Parse patent draft from AI response"""
+    try:
+        obj = extract_json(response)
+        if not isinstance(obj, dict):
+            logger.warning("Patent draft response was not a JSON object; using placeholder sections")
+        return _draft_from_json(obj)
+    except Exception as e:
+        logger.error("Error parsing patent draft: %s", e)
+        raise
+
+def parse_review_feedback(response: str) -> Dict[str, Any]:
+    """Parse review feedback from AI response"""
+    try:
+        obj = extract_json(response)
+        if not isinstance(obj, dict):
+            logger.warning("Review response was not a JSON object; using default feedback")
+        return _review_from_json(obj)
+    except Exception as e:
+        logger.error("Error parsing review feedback: %s", e)
+        raise
+
+def parse_optimized_claims(response: str) -> List[str]:
+    """Parse optimized claims from AI response"""
+    try:
+        claims = _str_list(_unwrap_list(extract_json(response), "claims")) or _list_items(response)
+        if not claims:
+            logger.warning("No optimized claims could be decoded; using placeholder claims")
+            return _default_optimized_claims()
+        return claims
+    except Exception as e:
+        logger.error("Error parsing optimized claims: %s", e)
+        raise
+
+def parse_draft_review_claims(response: str) -> Tuple[PatentDraft, Dict[str, Any], List[str]]:
+    """Parse a combined draft, review and optimized-claims response"""
+    try:
+        obj = extract_json(response)
+        if not isinstance(obj, dict):
+            logger.warning("Combined draft response was not a JSON object; using placeholder content")
+            obj = {}
+        claims = _str_list(_unwrap_list(obj.get("optimized_claims"), "claims"))
+        draft = _draft_from_json(obj.get("draft"))
+        # Without optimized claims the draft's own claims stand, so callers can
+        # adopt the returned list unconditionally
+        return (
+            draft,
+            _review_from_json(obj.get("review")),
+            claims or list(draft.claims)
+        )
+    except Exception as e:
+        logger.error("Error parsing combined draft response: %s", e)
+        raise
+
+def parse_diagram_descriptions(response: str) -> List[str]:
+    """Parse diagram descriptions from AI response"""
+    try:
+        diagrams = _str_list(_unwrap_list(extract_json(response), "diagrams")) or _list_items(response)
+        if diagrams:
+            return diagrams
+        logger.warning("No diagram descriptions could be decoded; using placeholder figures")
+        return [
+            "Figure 1: System Architecture - Shows the overall structure...",
+            "Figure 2: Component Diagram - Illustrates individual components...",
+            "Figure 3: Process Flow - Demonstrates the workflow..."
+        ]
+    except Exception as e:
+        logger.error("Error parsing diagram descriptions: %s", e)
+        raise
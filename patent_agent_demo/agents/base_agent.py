@@ -4,19 +4,28 @@ Provides common functionality and interface for all agents
 """
 
 import asyncio
+import json
 import logging
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TextIO
 from dataclasses import dataclass
 import time
 import uuid
 
 from ..fastmcp_config import (
-    FastMCPBroker, Message, MessageType, AgentStatus, fastmcp_config
+    Message, MessageType, AgentStatus, fastmcp_config
 )
 
 logger = logging.getLogger(__name__)
 
+# Number of recent task results each agent keeps in memory
+TASK_HISTORY_SIZE = 100
+
+# Broker name of the coordinator, which receives every task completion and error
+COORDINATOR_AGENT_NAME = "coordinator_agent"
+
 @dataclass
 class TaskResult:
     """Result of a task execution"""
@@ -26,6 +35,9 @@ class TaskResult:
     execution_time: float = 0.0
     metadata: Dict[str, Any] = None
 
+# Entry of an agent's TASK_HANDLERS table: an unbound async method taking the task data
+TaskHandler = Callable[[Any, Dict[str, Any]], Awaitable[TaskResult]]
+
 class BaseAgent(ABC):
     """Base class for all patent agents"""
     
@@ -35,7 +47,11 @@ class BaseAgent(ABC):
         self.broker = fastmcp_config.broker
         self.status = AgentStatus.IDLE
         self.current_task = None
-        self.task_history: List[TaskResult] = []
+        self.task_history: Deque[TaskResult] = deque(maxlen=TASK_HISTORY_SIZE)
+        # Optional append-only JSONL record of every task, for analysis after
+        # the in-memory history has rolled over
+        self.task_log_path = os.getenv("PATENT_TASK_LOG_PATH")
+        self._task_log: Optional[TextIO] = None
         self.performance_metrics = {
             "tasks_completed": 0,
             "tasks_failed": 0,
@@ -44,20 +60,20 @@ class BaseAgent(ABC):
         }
         self.is_running = False
         
-        logger.info(f"Initialized agent: {name} with capabilities: {capabilities}")
+        logger.info("Initialized agent: %s with capabilities: %s", name, capabilities)
         
     async def start(self):
         """Start the agent"""
         try:
             await self.broker.register_agent(self.name, self.capabilities)
             self.is_running = True
-            logger.info(f"Agent {self.name} started successfully")
+            logger.info("Agent %s started successfully", self.name)
             
             # Start the main agent loop
             asyncio.create_task(self._agent_loop())
             
         except Exception as e:
-            logger.error(f"Failed to start agent {self.name}: {e}")
+            logger.error("Failed to start agent %s: %s", self.name, e)
             raise
             
     async def stop(self):
@@ -65,10 +81,14 @@ class BaseAgent(ABC):
         try:
             self.is_running = False
             await self.broker.unregister_agent(self.name)
-            logger.info(f"Agent {self.name} stopped successfully")
+            
+            if self._task_log is not None:
+                self._task_log.close()
+                self._task_log = None
+            logger.info("Agent %s stopped successfully", self.name)
             
         except Exception as e:
-            logger.error(f"Error stopping agent {self.name}: {e}")
+            logger.error("Error stopping agent %s: %s", self.name, e)
             
     async def _agent_loop(self):
         """Main agent loop for processing messages and tasks"""
@@ -89,13 +109,13 @@ class BaseAgent(ABC):
                 await asyncio.sleep(0.1)
                 
             except Exception as e:
-                logger.error(f"Error in agent loop for {self.name}: {e}")
+                logger.error("Error in agent loop for %s: %s", self.name, e)
                 await asyncio.sleep(1.0)  # Longer delay on error
                 
     async def _process_message(self, message: Message):
         """Process an incoming message"""
         try:
-            logger.info(f"Agent {self.name} processing message: {message.type.value}")
+            logger.info("Agent %s processing message: %s", self.name, message.type.value)
             
             # Update status to busy
             self.status = AgentStatus.BUSY
@@ -115,7 +135,7 @@ class BaseAgent(ABC):
             await self.broker.update_agent_status(self.name, self.status)
             
         except Exception as e:
-            logger.error(f"Error processing message in {self.name}: {e}")
+            logger.error("Error processing message in %s: %s", self.name, e)
             self.status = AgentStatus.ERROR
             await self.broker.update_agent_status(self.name, self.status)
             
@@ -140,10 +160,10 @@ class BaseAgent(ABC):
             if task_type in self.capabilities:
                 await self._execute_task(task_data)
             else:
-                logger.warning(f"Agent {self.name} cannot handle task type: {task_type}")
+                logger.warning("Agent %s cannot handle task type: %s", self.name, task_type)
                 
         except Exception as e:
-            logger.error(f"Error handling coordination message: {e}")
+            logger.error("Error handling coordination message: %s", e)
             
     async def _handle_status_message(self, message: Message):
         """Handle status update messages"""
@@ -155,30 +175,30 @@ class BaseAgent(ABC):
                     self.status = AgentStatus(new_status)
                     
         except Exception as e:
-            logger.error(f"Error handling status message: {e}")
+            logger.error("Error handling status message: %s", e)
             
     async def _handle_specific_message(self, message: Message):
         """Handle specific message types - to be implemented by subclasses"""
         try:
             # This method should be overridden by specific agents
-            logger.info(f"Agent {self.name} received specific message: {message.type.value}")
+            logger.info("Agent %s received specific message: %s", self.name, message.type.value)
             
         except Exception as e:
-            logger.error(f"Error handling specific message: {e}")
+            logger.error("Error handling specific message: %s", e)
             
     async def _execute_task(self, task_data: Dict[str, Any]):
         """Execute a specific task"""
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             task_id = task_data.get("id", str(uuid.uuid4()))
             
-            logger.info(f"Agent {self.name} executing task: {task_id}")
+            logger.info("Agent %s executing task: %s", self.name, task_id)
             
             # Execute the task using the abstract method
             result = await self.execute_task(task_data)
             
             # Calculate execution time
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             # Update performance metrics
             self._update_performance_metrics(result.success, execution_time)
@@ -192,42 +212,65 @@ class BaseAgent(ABC):
                 metadata=result.metadata
             )
             self.task_history.append(task_result)
+            if self.task_log_path:
+                self._log_task(task_id, task_result)
             
             # Send completion message
             completion_message = Message(
                 id=f"completion_{uuid.uuid4()}",
                 type=MessageType.STATUS,
                 sender=self.name,
-                recipient="coordinator",
+                recipient=COORDINATOR_AGENT_NAME,
                 content={
                     "task_id": task_id,
+                    "workflow_id": task_data.get("workflow_id"),
+                    "stage_index": task_data.get("stage_index"),
                     "status": "completed",
                     "result": result.data,
                     "execution_time": execution_time,
-                    "success": result.success
+                    "success": result.success,
+                    "error_message": result.error_message
                 },
                 timestamp=time.time(),
                 priority=5
             )
             await self.broker.send_message(completion_message)
             
-            logger.info(f"Agent {self.name} completed task {task_id} in {execution_time:.2f}s")
+            logger.info("Agent %s completed task %s in %.2fs", self.name, task_id, execution_time)
             
         except Exception as e:
-            logger.error(f"Error executing task in {self.name}: {e}")
+            logger.error("Error executing task in %s: %s", self.name, e)
             
             # Send error message
             error_message = Message(
                 id=f"error_{uuid.uuid4()}",
                 type=MessageType.ERROR,
                 sender=self.name,
-                recipient="coordinator",
-                content={"error": str(e), "task_id": task_data.get("id")},
+                recipient=COORDINATOR_AGENT_NAME,
+                content={
+                    "error": str(e),
+                    "task_id": task_data.get("id"),
+                    "workflow_id": task_data.get("workflow_id"),
+                    "stage_index": task_data.get("stage_index")
+                },
                 timestamp=time.time(),
                 priority=10
             )
             await self.broker.send_message(error_message)
             
+    def _log_task(self, task_id: str, task_result: TaskResult):
+        """Append a summary of a finished task to the JSONL task log"""
+        if self._task_log is None:
+            self._task_log = open(self.task_log_path, "a", encoding="utf-8", buffering=1 << 16)
+        self._task_log.write(json.dumps({
+            "agent": self.name,
+            "task_id": task_id,
+            "success": task_result.success,
+            "error_message": task_result.error_message,
+            "execution_time": task_result.execution_time,
+            "timestamp": time.time()
+        }, ensure_ascii=False) + "\n")
+        
     def _update_performance_metrics(self, success: bool, execution_time: float):
         """Update agent performance metrics"""
         if success:
@@ -246,6 +289,14 @@ class BaseAgent(ABC):
         """Execute a specific task - must be implemented by subclasses"""
         pass
         
+    def _unsupported_task(self, task_data: Dict[str, Any]) -> TaskResult:
+        """Failed result for a task type the agent advertises but does not implement yet"""
+        return TaskResult(
+            success=False,
+            data={},
+            error_message=f"Task type {task_data.get('type')} is not implemented by {self.name}"
+        )
+        
     async def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
         return {
@@ -254,7 +305,8 @@ class BaseAgent(ABC):
             "current_task": self.current_task,
             "capabilities": self.capabilities,
             "performance_metrics": self.performance_metrics,
-            "task_history_count": len(self.task_history)
+            "task_history_count": (self.performance_metrics["tasks_completed"] +
+                                   self.performance_metrics["tasks_failed"])
         }
         
     async def send_message(self, recipient: str, message_type: MessageType, 
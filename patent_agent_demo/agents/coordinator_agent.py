@@ -6,15 +6,45 @@ Orchestrates the entire patent development workflow across all agents
 import asyncio
 import logging
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
 import time
 import uuid
 
-from .base_agent import BaseAgent, TaskResult
-from ..fastmcp_config import MessageType, AgentStatus
+from .base_agent import BaseAgent, TaskResult, TaskHandler, COORDINATOR_AGENT_NAME
+from ..fastmcp_config import Message, MessageType
 
 logger = logging.getLogger(__name__)
 
+# Static workflow definition, built once at import rather than per workflow/stage
+WORKFLOW_STAGE_DEFINITIONS = (
+    ("Planning & Strategy", "planner_agent"),
+    ("Prior Art Search", "searcher_agent"),
+    ("Innovation Discussion", "discusser_agent"),
+    ("Patent Drafting", "writer_agent"),
+    ("Quality Review", "reviewer_agent"),
+    ("Final Rewrite", "rewriter_agent"),
+)
+
+STAGE_TASK_TYPES = {
+    "Planning & Strategy": "patent_planning",
+    "Prior Art Search": "prior_art_search",
+    "Innovation Discussion": "innovation_discussion",
+    "Patent Drafting": "patent_drafting",
+    "Quality Review": "patent_review",
+    "Final Rewrite": "patent_rewrite"
+}
+
+# Seconds before a failed stage gets its single retry
+STAGE_RETRY_DELAY = 5
+
+# Summary reported when a workflow finished without any stage results
+DEFAULT_PATENT_SUMMARY = {
+    "title": "Generated Patent Title",
+    "status": "Ready for Filing",
+    "confidence_score": 0.92
+}
+
 @dataclass
 class WorkflowStage:
     """Workflow stage definition"""
@@ -37,18 +67,19 @@ class PatentWorkflow:
     overall_status: str
     start_time: float
     estimated_completion: Optional[float] = None
-    results: Dict[str, Any] = None
+    results: Dict[str, Any] = field(default_factory=dict)
 
 class CoordinatorAgent(BaseAgent):
     """Agent responsible for orchestrating the entire patent development workflow"""
     
     def __init__(self):
         super().__init__(
-            name="coordinator_agent",
+            name=COORDINATOR_AGENT_NAME,
             capabilities=["workflow_orchestration", "agent_coordination", "progress_tracking", "quality_assurance"]
         )
         self.active_workflows: Dict[str, PatentWorkflow] = {}
-        self.workflow_templates = self._load_workflow_templates()
+        # Final results of finished workflows, kept until the caller collects them
+        self.completed_workflows: Dict[str, Dict[str, Any]] = {}
         self.agent_dependencies = self._load_agent_dependencies()
         
     async def start(self):
@@ -61,23 +92,17 @@ class CoordinatorAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "start_patent_workflow":
-                return await self._start_patent_workflow(task_data)
-            elif task_type == "monitor_workflow":
-                return await self._monitor_workflow(task_data)
-            elif task_type == "handle_workflow_completion":
-                return await self._handle_workflow_completion(task_data)
-            elif task_type == "escalate_issue":
-                return await self._escalate_issue(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Coordinator Agent: {e}")
+            logger.error("Error executing task in Coordinator Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -98,12 +123,13 @@ class CoordinatorAgent(BaseAgent):
                 )
                 
             workflow_id = str(uuid.uuid4())
-            logger.info(f"Starting patent workflow {workflow_id} for: {topic}")
+            logger.info("Starting patent workflow %s for: %s", workflow_id, topic)
             
             # Create workflow stages
             stages = await self._create_workflow_stages(topic, description)
             
-            # Initialize workflow
+            # Initialize workflow; one clock read serves both timestamps
+            now = time.time()
             workflow = PatentWorkflow(
                 workflow_id=workflow_id,
                 topic=topic,
@@ -111,15 +137,14 @@ class CoordinatorAgent(BaseAgent):
                 stages=stages,
                 current_stage=0,
                 overall_status="initialized",
-                start_time=time.time(),
-                results={}
+                start_time=now
             )
             
             # Store workflow
             self.active_workflows[workflow_id] = workflow
             
-            # Start first stage
-            await self._execute_workflow_stage(workflow_id, 0)
+            # Start every stage with no unmet dependencies
+            await self._dispatch_ready_stages(workflow_id)
             
             return TaskResult(
                 success=True,
@@ -130,12 +155,12 @@ class CoordinatorAgent(BaseAgent):
                 },
                 metadata={
                     "workflow_type": "patent_development",
-                    "creation_timestamp": time.time()
+                    "creation_timestamp": now
                 }
             )
             
         except Exception as e:
-            logger.error(f"Error starting patent workflow: {e}")
+            logger.error("Error starting patent workflow: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -146,42 +171,14 @@ class CoordinatorAgent(BaseAgent):
         """Create workflow stages for patent development"""
         try:
             stages = [
-                WorkflowStage(
-                    stage_name="Planning & Strategy",
-                    agent_name="planner_agent",
-                    status="pending"
-                ),
-                WorkflowStage(
-                    stage_name="Prior Art Search",
-                    agent_name="searcher_agent",
-                    status="pending"
-                ),
-                WorkflowStage(
-                    stage_name="Innovation Discussion",
-                    agent_name="discusser_agent",
-                    status="pending"
-                ),
-                WorkflowStage(
-                    stage_name="Patent Drafting",
-                    agent_name="writer_agent",
-                    status="pending"
-                ),
-                WorkflowStage(
-                    stage_name="Quality Review",
-                    agent_name="reviewer_agent",
-                    status="pending"
-                ),
-                WorkflowStage(
-                    stage_name="Final Rewrite",
-                    agent_name="rewriter_agent",
-                    status="pending"
-                )
+                WorkflowStage(stage_name=stage_name, agent_name=agent_name, status="pending")
+                for stage_name, agent_name in WORKFLOW_STAGE_DEFINITIONS
             ]
             
             return stages
             
         except Exception as e:
-            logger.error(f"Error creating workflow stages: {e}")
+            logger.error("Error creating workflow stages: %s", e)
             raise
             
     async def _execute_workflow_stage(self, workflow_id: str, stage_index: int):
@@ -189,11 +186,11 @@ class CoordinatorAgent(BaseAgent):
         try:
             workflow = self.active_workflows.get(workflow_id)
             if not workflow:
-                logger.error(f"Workflow {workflow_id} not found")
+                logger.error("Workflow %s not found", workflow_id)
                 return
                 
             if stage_index >= len(workflow.stages):
-                logger.info(f"Workflow {workflow_id} completed all stages")
+                logger.info("Workflow %s completed all stages", workflow_id)
                 await self._complete_workflow(workflow_id)
                 return
                 
@@ -201,7 +198,11 @@ class CoordinatorAgent(BaseAgent):
             stage.status = "running"
             stage.start_time = time.time()
             
-            logger.info(f"Executing stage {stage_index}: {stage.stage_name} using {stage.agent_name}")
+            logger.info("Executing stage %s: %s using %s", stage_index, stage.stage_name, stage.agent_name)
+            
+            # Drafting, review and rewrite need the analysis, draft and feedback
+            # produced by earlier stages
+            stage_outputs = {s.agent_name: s.result for s in workflow.stages if s.result}
             
             # Send task to appropriate agent
             task_message = await self.send_message(
@@ -215,7 +216,10 @@ class CoordinatorAgent(BaseAgent):
                         "stage_index": stage_index,
                         "topic": workflow.topic,
                         "description": workflow.description,
-                        "previous_results": workflow.results
+                        "previous_results": workflow.results,
+                        "analysis": stage_outputs.get("planner_agent", {}).get("analysis"),
+                        "patent_draft": stage_outputs.get("writer_agent", {}).get("patent_draft"),
+                        "review_feedback": stage_outputs.get("reviewer_agent", {}).get("feedback", {})
                     }
                 },
                 priority=5
@@ -226,20 +230,59 @@ class CoordinatorAgent(BaseAgent):
             workflow.overall_status = "running"
             
         except Exception as e:
-            logger.error(f"Error executing workflow stage: {e}")
+            logger.error("Error executing workflow stage: %s", e)
             await self._handle_stage_error(workflow_id, stage_index, str(e))
             
+    async def _handle_status_message(self, message: Message):
+        """Route stage completions reported by agents to their workflow"""
+        content = message.content
+        workflow_id = content.get("workflow_id")
+        stage_index = content.get("stage_index")
+        if workflow_id is None or stage_index is None or message.sender == self.name:
+            await super()._handle_status_message(message)
+            return
+            
+        if content.get("success"):
+            await self._handle_stage_completion(workflow_id, stage_index, content.get("result", {}))
+        else:
+            await self._handle_stage_error(
+                workflow_id, stage_index, content.get("error_message") or "Stage task failed"
+            )
+            
+    async def _handle_specific_message(self, message: Message):
+        """Route errors raised while an agent executed a workflow stage"""
+        content = message.content
+        workflow_id = content.get("workflow_id")
+        stage_index = content.get("stage_index")
+        # The coordinator's own escalation broadcasts carry the same keys; skip them
+        if (message.type == MessageType.ERROR and message.sender != self.name
+                and workflow_id is not None and stage_index is not None):
+            await self._handle_stage_error(workflow_id, stage_index, content.get("error", "Unknown error"))
+        else:
+            await super()._handle_specific_message(message)
+            
+    def _get_ready_stages(self, workflow: PatentWorkflow) -> List[int]:
+        """Get indices of pending stages whose dependencies have all completed"""
+        completed_agents = {s.agent_name for s in workflow.stages if s.status == "completed"}
+        return [
+            i for i, stage in enumerate(workflow.stages)
+            if stage.status == "pending"
+            and all(dep in completed_agents for dep in self.agent_dependencies.get(stage.agent_name, []))
+        ]
+        
+    async def _dispatch_ready_stages(self, workflow_id: str):
+        """Execute all currently runnable stages of a workflow concurrently"""
+        workflow = self.active_workflows.get(workflow_id)
+        if not workflow or workflow.overall_status == "error":
+            return
+            
+        ready_stages = self._get_ready_stages(workflow)
+        if ready_stages:
+            await asyncio.gather(*(self._execute_workflow_stage(workflow_id, i) for i in ready_stages))
+            
     def _get_task_type_for_stage(self, stage_name: str) -> str:
         """Get the task type for a specific stage"""
-        task_mapping = {
-            "Planning & Strategy": "patent_planning",
-            "Prior Art Search": "prior_art_search",
-            "Innovation Discussion": "innovation_discussion",
-            "Patent Drafting": "patent_drafting",
-            "Quality Review": "patent_review",
-            "Final Rewrite": "patent_rewrite"
-        }
-        return task_mapping.get(stage_name, "unknown")
+        return STAGE_TASK_TYPES.get(stage_name, "unknown")
         
     async def _handle_stage_completion(self, workflow_id: str, stage_index: int, result: Dict[str, Any]):
         """Handle completion of a workflow stage"""
@@ -256,17 +299,17 @@ class CoordinatorAgent(BaseAgent):
             # Store results
             workflow.results[f"stage_{stage_index}"] = result
             
-            logger.info(f"Stage {stage_index} completed for workflow {workflow_id}")
+            logger.info("Stage %s completed for workflow %s", stage_index, workflow_id)
             
             # Check if workflow is complete
-            if stage_index == len(workflow.stages) - 1:
+            if all(s.status == "completed" for s in workflow.stages):
                 await self._complete_workflow(workflow_id)
             else:
-                # Move to next stage
-                await self._execute_workflow_stage(workflow_id, stage_index + 1)
+                # Start whichever stages this completion unblocked
+                await self._dispatch_ready_stages(workflow_id)
                 
         except Exception as e:
-            logger.error(f"Error handling stage completion: {e}")
+            logger.error("Error handling stage completion: %s", e)
             
     async def _handle_stage_error(self, workflow_id: str, stage_index: int, error: str):
         """Handle errors in workflow stages"""
@@ -280,15 +323,13 @@ class CoordinatorAgent(BaseAgent):
             stage.error = error
             stage.end_time = time.time()
             
-            workflow.overall_status = "error"
-            
-            logger.error(f"Stage {stage_index} failed for workflow {workflow_id}: {error}")
+            logger.error("Stage %s failed for workflow %s: %s", stage_index, workflow_id, error)
             
             # Attempt to recover or escalate
             await self._attempt_recovery(workflow_id, stage_index)
             
         except Exception as e:
-            logger.error(f"Error handling stage error: {e}")
+            logger.error("Error handling stage error: %s", e)
             
     async def _attempt_recovery(self, workflow_id: str, stage_index: int):
         """Attempt to recover from a stage error"""
@@ -302,7 +343,7 @@ class CoordinatorAgent(BaseAgent):
             # Check if we can retry
             if stage.status == "error" and not hasattr(stage, 'retry_count'):
                 stage.retry_count = 1
-                logger.info(f"Retrying stage {stage_index} for workflow {workflow_id}")
+                logger.info("Retrying stage %s for workflow %s", stage_index, workflow_id)
                 
                 # Reset stage and retry
                 stage.status = "pending"
@@ -310,11 +351,16 @@ class CoordinatorAgent(BaseAgent):
                 stage.end_time = None
                 stage.error = None
                 
-                await asyncio.sleep(5)  # Wait before retry
-                await self._execute_workflow_stage(workflow_id, stage_index)
+                # Scheduled rather than awaited so the wait does not hold up
+                # message routing for every other workflow
+                asyncio.get_running_loop().call_later(
+                    STAGE_RETRY_DELAY, self._retry_workflow_stage, workflow_id, stage_index
+                )
                 
             else:
-                # Escalate the issue
+                # The workflow stays in "error" so waiting callers stop and
+                # report the failure instead of timing out
+                workflow.overall_status = "error"
                 await self._escalate_issue({
                     "workflow_id": workflow_id,
                     "stage_index": stage_index,
@@ -323,7 +369,13 @@ class CoordinatorAgent(BaseAgent):
                 })
                 
         except Exception as e:
-            logger.error(f"Error attempting recovery: {e}")
+            logger.error("Error attempting recovery: %s", e)
+            
+    def _retry_workflow_stage(self, workflow_id: str, stage_index: int):
+        """Re-run a failed stage unless its workflow has failed meanwhile"""
+        workflow = self.active_workflows.get(workflow_id)
+        if workflow and workflow.overall_status != "error":
+            asyncio.ensure_future(self._execute_workflow_stage(workflow_id, stage_index))
             
     async def _complete_workflow(self, workflow_id: str):
         """Complete a workflow"""
@@ -338,7 +390,7 @@ class CoordinatorAgent(BaseAgent):
             # Compile final results
             final_results = await self._compile_final_results(workflow)
             
-            logger.info(f"Workflow {workflow_id} completed successfully")
+            logger.info("Workflow %s completed successfully", workflow_id)
             
             # Send completion notification
             await self.broadcast_message(
@@ -352,11 +404,12 @@ class CoordinatorAgent(BaseAgent):
                 priority=3
             )
             
-            # Clean up workflow
+            # Clean up workflow, keeping its results for the caller
+            self.completed_workflows[workflow_id] = final_results
             del self.active_workflows[workflow_id]
             
         except Exception as e:
-            logger.error(f"Error completing workflow: {e}")
+            logger.error("Error completing workflow: %s", e)
             
     async def _compile_final_results(self, workflow: PatentWorkflow) -> Dict[str, Any]:
         """Compile final results from all workflow stages"""
@@ -369,12 +422,7 @@ class CoordinatorAgent(BaseAgent):
                     "completion_time": workflow.estimated_completion - workflow.start_time,
                     "overall_status": workflow.overall_status
                 },
-                "stage_results": {},
-                "patent_summary": {
-                    "title": "Generated Patent Title",
-                    "status": "Ready for Filing",
-                    "confidence_score": 0.92
-                }
+                "stage_results": {}
             }
             
             # Compile stage results
@@ -387,41 +435,57 @@ class CoordinatorAgent(BaseAgent):
                         "result": stage.result
                     }
                     
-            # Generate patent summary from results
+            # Generate patent summary from results, falling back to the default
             if workflow.results:
                 final_results["patent_summary"] = await self._generate_patent_summary(workflow.results)
+            else:
+                logger.warning("Workflow %s has no stage results; reporting the placeholder patent summary",
+                               workflow.workflow_id)
+                final_results["patent_summary"] = dict(DEFAULT_PATENT_SUMMARY)
                 
             return final_results
             
         except Exception as e:
-            logger.error(f"Error compiling final results: {e}")
+            logger.error("Error compiling final results: %s", e)
             return {"error": str(e)}
             
     async def _generate_patent_summary(self, stage_results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate patent summary from stage results"""
         try:
-            # Extract key information from different stages
-            planning_result = stage_results.get("stage_0", {}).get("result", {})
-            search_result = stage_results.get("stage_1", {}).get("result", {})
-            writing_result = stage_results.get("stage_3", {}).get("result", {})
-            review_result = stage_results.get("stage_4", {}).get("result", {})
-            
+            # Each stage result is the agent's TaskResult.data, which holds
+            # the agents' own objects rather than plain dicts
+            analysis = stage_results.get("stage_0", {}).get("analysis")
+            search_report = stage_results.get("stage_1", {}).get("search_report")
+            patent_draft = stage_results.get("stage_3", {}).get("patent_draft")
+            review_result = stage_results.get("stage_4", {}).get("review_result")
+            
+            # Placeholders must never pass silently for a real result
+            missing = [
+                name for name, value in (
+                    ("analysis", analysis), ("search_report", search_report),
+                    ("patent_draft", patent_draft), ("review_result", review_result)
+                ) if value is None
+            ]
+            if missing:
+                logger.warning("Stage results lack %s; the patent summary uses placeholders for them",
+                               ", ".join(missing))
+                
             # Compile summary
             summary = {
-                "title": writing_result.get("title", "Generated Patent Title"),
-                "status": "Ready for Filing",
-                "confidence_score": 0.92,
-                "key_claims": writing_result.get("claims", []),
-                "prior_art_analysis": search_result.get("prior_art", []),
-                "novelty_score": planning_result.get("novelty_score", 8.5),
-                "inventive_step": planning_result.get("inventive_step_score", 7.8),
-                "recommendations": review_result.get("recommendations", [])
+                "title": patent_draft.title if patent_draft else DEFAULT_PATENT_SUMMARY["title"],
+                "status": DEFAULT_PATENT_SUMMARY["status"],
+                "confidence_score": DEFAULT_PATENT_SUMMARY["confidence_score"],
+                "key_claims": list(patent_draft.claims) if patent_draft else [],
+                "prior_art_analysis": [asdict(r) for r in search_report.results] if search_report else [],
+                "novelty_score": analysis.novelty_score if analysis else 8.5,
+                "inventive_step": analysis.inventive_step_score if analysis else 7.8,
+                "recommendations": list(review_result.recommendations) if review_result else []
             }
             
             return summary
             
         except Exception as e:
-            logger.error(f"Error generating patent summary: {e}")
+            logger.error("Error generating patent summary: %s", e)
             return {
                 "title": "Generated Patent",
                 "status": "Completed",
@@ -441,10 +505,20 @@ class CoordinatorAgent(BaseAgent):
                         success=True,
                         data={
                             "workflow": workflow,
+                            "overall_status": workflow.overall_status,
+                            "error": next((s.error for s in workflow.stages if s.status == "error"), None),
                             "current_stage": workflow.stages[workflow.current_stage] if workflow.stages else None,
                             "progress": f"{workflow.current_stage + 1}/{len(workflow.stages)}"
                         }
                     )
+                elif workflow_id in self.completed_workflows:
+                    return TaskResult(
+                        success=True,
+                        data={
+                            "overall_status": "completed",
+                            "results": self.completed_workflows[workflow_id]
+                        }
+                    )
                 else:
                     return TaskResult(
                         success=False,
@@ -472,7 +546,7 @@ class CoordinatorAgent(BaseAgent):
                 )
                 
         except Exception as e:
-            logger.error(f"Error monitoring workflow: {e}")
+            logger.error("Error monitoring workflow: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -495,7 +569,7 @@ class CoordinatorAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error handling workflow completion: {e}")
+            logger.error("Error handling workflow completion: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -509,7 +583,7 @@ class CoordinatorAgent(BaseAgent):
             stage_index = task_data.get("stage_index")
             error = task_data.get("error")
             
-            logger.warning(f"Issue escalated for workflow {workflow_id}, stage {stage_index}: {error}")
+            logger.warning("Issue escalated for workflow %s, stage %s: %s", workflow_id, stage_index, error)
             
             # Send escalation message
             await self.broadcast_message(
@@ -530,13 +604,18 @@ class CoordinatorAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error escalating issue: {e}")
+            logger.error("Error escalating issue: %s", e)
             return TaskResult(
                 success=False,
                 data={},
                 error_message=str(e)
             )
             
+    @cached_property
+    def workflow_templates(self) -> Dict[str, Any]:
+        """Workflow templates for different patent types, built on first use"""
+        return self._load_workflow_templates()
+        
     def _load_workflow_templates(self) -> Dict[str, Any]:
         """Load workflow templates for different patent types"""
         return {
@@ -558,9 +637,19 @@ class CoordinatorAgent(BaseAgent):
         """Load agent dependency information"""
         return {
             "planner_agent": [],
-            "searcher_agent": ["planner_agent"],
+            # Prior art search only needs the topic and description, so it runs alongside planning
+            "searcher_agent": [],
             "discusser_agent": ["planner_agent", "searcher_agent"],
             "writer_agent": ["planner_agent", "searcher_agent", "discusser_agent"],
             "reviewer_agent": ["writer_agent"],
             "rewriter_agent": ["reviewer_agent"]
-        }
\ No newline at end of file
+        }
+
+# Workflow control requests the coordinator accepts. Handlers are the methods
+# themselves, so a misspelt name fails at import rather than at dispatch
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "start_patent_workflow": CoordinatorAgent._start_patent_workflow,
+    "monitor_workflow": CoordinatorAgent._monitor_workflow,
+    "handle_workflow_completion": CoordinatorAgent._handle_workflow_completion,
+    "escalate_issue": CoordinatorAgent._escalate_issue,
+}
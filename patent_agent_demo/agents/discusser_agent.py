@@ -5,14 +5,86 @@ Facilitates multi-agent discussions and brainstorming sessions
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import cached_property
 
-from .base_agent import BaseAgent, TaskResult
+from .base_agent import BaseAgent, TaskResult, TaskHandler
 from ..google_a2a_client import get_google_a2a_client
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates, parsed once at import and filled with str.format_map per call.
+# Fixed instructions come first and per-call inputs last, so calls share a prefix.
+AGENDA_PROMPT_TEMPLATE = """\
+Generate a discussion agenda for an innovation brainstorming session.
+
+Create 5-7 agenda items that will help explore:
+1. Technical challenges and solutions
+2. Alternative approaches
+3. Innovation opportunities
+4. Risk mitigation strategies
+5. Implementation considerations
+
+Return only the agenda items, one per line.
+
+Topic: {topic}
+Description: {description}
+
+Previous Results: {previous_results}
+"""
+
+INSIGHTS_PROMPT_TEMPLATE = """\
+Generate 3-5 key insights for this discussion agenda item.
+
+Focus on practical, actionable insights that advance the discussion.
+
+Agenda Item: {agenda_item}
+Topic: {topic}
+Previous Results: {previous_results}
+"""
+
+ALTERNATIVES_PROMPT_TEMPLATE = """\
+Generate 2-3 alternative approaches for this agenda item.
+
+Consider different perspectives, technologies, and methodologies.
+
+Agenda Item: {agenda_item}
+Topic: {topic}
+"""
+
+CONSENSUS_PROMPT_TEMPLATE = """\
+Based on these insights, build a consensus statement.
+
+Create a clear, actionable consensus that all participants can agree on.
+
+Agenda Item: {agenda_item}
+Insights: {insights}
+"""
+
+NEXT_STEPS_PROMPT_TEMPLATE = """\
+Based on this discussion outcome, generate 3-5 actionable next steps.
+
+Focus on concrete, measurable actions that move the project forward.
+
+Key Insights: {key_insights}
+Innovative Solutions: {innovative_solutions}
+Consensus Points: {consensus_points}
+"""
+
+SOLUTIONS_PROMPT_TEMPLATE = """\
+Based on the discussion, generate 3-5 innovative solutions.
+
+Focus on breakthrough ideas that address the core challenges.
+
+Topic: {topic}
+Description: {description}
+Discussion Insights: {key_insights}
+"""
+
+# Agents taking part in every discussion session
+DISCUSSION_PARTICIPANTS = ("planner_agent", "searcher_agent", "writer_agent", "reviewer_agent")
+
 @dataclass
 class DiscussionSession:
     """Discussion session definition"""
@@ -28,6 +100,11 @@ class DiscussionSession:
 @dataclass
 class DiscussionOutcome:
     """Outcome of a discussion session"""
+    __slots__ = (
+        "session_id", "key_insights", "innovative_solutions", "alternative_approaches",
+        "consensus_points", "disagreements", "next_steps"
+    )
+    
     session_id: str
     key_insights: List[str]
     innovative_solutions: List[str]
@@ -42,11 +119,10 @@ class DiscusserAgent(BaseAgent):
     def __init__(self):
         super().__init__(
             name="discusser_agent",
-            capabilities=["discussion_facilitation", "brainstorming", "consensus_building", "idea_refinement"]
+            capabilities=["innovation_discussion", "discussion_facilitation", "brainstorming", "consensus_building", "idea_refinement"]
         )
         self.google_a2a_client = None
         self.active_sessions: Dict[str, DiscussionSession] = {}
-        self.discussion_templates = self._load_discussion_templates()
         
     async def start(self):
         """Start the discusser agent"""
@@ -59,23 +135,17 @@ class DiscusserAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "innovation_discussion":
-                return await self._facilitate_innovation_discussion(task_data)
-            elif task_type == "brainstorming_session":
-                return await self._conduct_brainstorming_session(task_data)
-            elif task_type == "consensus_building":
-                return await self._build_consensus(task_data)
-            elif task_type == "idea_refinement":
-                return await self._refine_ideas(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Discusser Agent: {e}")
+            logger.error("Error executing task in Discusser Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -88,6 +158,8 @@ class DiscusserAgent(BaseAgent):
             topic = task_data.get("topic")
             description = task_data.get("description")
             previous_results = task_data.get("previous_results", {})
+            # Rendered into the agenda prompt and every insights prompt, so format it once
+            previous_results_text = str(previous_results)
             
             if not topic:
                 return TaskResult(
@@ -96,17 +168,17 @@ class DiscusserAgent(BaseAgent):
                     error_message="Topic is required for innovation discussion"
                 )
                 
-            logger.info(f"Facilitating innovation discussion for: {topic}")
+            logger.info("Facilitating innovation discussion for: %s", topic)
             
             # Create discussion session
             session = await self._create_discussion_session(topic, description)
             
             # Generate discussion agenda
-            agenda = await self._generate_discussion_agenda(topic, description, previous_results)
+            agenda = await self._generate_discussion_agenda(topic, description, previous_results_text)
             session.agenda = agenda
             
             # Conduct the discussion
-            discussion_outcome = await self._conduct_discussion(session, previous_results)
+            discussion_outcome = await self._conduct_discussion(session, previous_results_text)
             
             # Generate innovative solutions
             innovative_solutions = await self._generate_innovative_solutions(topic, description, discussion_outcome)
@@ -147,7 +219,7 @@ class DiscusserAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error facilitating innovation discussion: {e}")
+            logger.error("Error facilitating innovation discussion: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -157,53 +229,34 @@ class DiscusserAgent(BaseAgent):
     async def _create_discussion_session(self, topic: str, description: str) -> DiscussionSession:
         """Create a new discussion session"""
         try:
-            session_id = f"discussion_{asyncio.get_event_loop().time()}"
-            
-            # Define participants (other agents)
-            participants = [
-                "planner_agent",
-                "searcher_agent", 
-                "writer_agent",
-                "reviewer_agent"
-            ]
+            now = asyncio.get_event_loop().time()
+            session_id = f"discussion_{now}"
             
             session = DiscussionSession(
                 session_id=session_id,
                 topic=topic,
-                participants=participants,
+                participants=list(DISCUSSION_PARTICIPANTS),
                 agenda=[],
-                start_time=asyncio.get_event_loop().time()
+                start_time=now
             )
             
             self.active_sessions[session_id] = session
             return session
             
         except Exception as e:
-            logger.error(f"Error creating discussion session: {e}")
+            logger.error("Error creating discussion session: %s", e)
             raise
             
     async def _generate_discussion_agenda(self, topic: str, description: str, 
-                                        previous_results: Dict[str, Any]) -> List[str]:
+                                        previous_results_text: str) -> List[str]:
         """Generate discussion agenda based on topic and previous results"""
         try:
             # Use Google A2A to generate discussion agenda
-            prompt = f"""
-            Generate a discussion agenda for an innovation brainstorming session:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Previous Results: {previous_results}
-            
-            Create 5-7 agenda items that will help explore:
-            1. Technical challenges and solutions
-            2. Alternative approaches
-            3. Innovation opportunities
-            4. Risk mitigation strategies
-            5. Implementation considerations
-            
-            Return only the agenda items, one per line.
-            """
+            prompt = AGENDA_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description,
+                "previous_results": previous_results_text
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -222,7 +275,7 @@ class DiscusserAgent(BaseAgent):
             return agenda_items
             
         except Exception as e:
-            logger.error(f"Error generating discussion agenda: {e}")
+            logger.error("Error generating discussion agenda: %s", e)
             # Return default agenda if AI generation fails
             return [
                 "Review current understanding",
@@ -233,7 +286,7 @@ class DiscusserAgent(BaseAgent):
             ]
             
     async def _conduct_discussion(self, session: DiscussionSession, 
-                                 previous_results: Dict[str, Any]) -> Dict[str, Any]:
+                                 previous_results_text: str) -> Dict[str, Any]:
         """Conduct the actual discussion session"""
         try:
             discussion_outcome = {
@@ -244,24 +297,16 @@ class DiscusserAgent(BaseAgent):
                 "next_steps": []
             }
             
-            # Simulate discussion for each agenda item
-            for agenda_item in session.agenda:
-                logger.info(f"Discussing agenda item: {agenda_item}")
-                
-                # Generate insights for this agenda item
-                insights = await self._generate_insights_for_agenda_item(
-                    agenda_item, session.topic, previous_results
-                )
+            # Agenda items are independent of each other, so they are discussed
+            # concurrently; results are merged back in agenda order
+            item_outcomes = await asyncio.gather(*(
+                self._discuss_agenda_item(agenda_item, session.topic, previous_results_text)
+                for agenda_item in session.agenda
+            ))
+            
+            for insights, alternatives, consensus in item_outcomes:
                 discussion_outcome["key_insights"].extend(insights)
-                
-                # Generate alternative approaches
-                alternatives = await self._generate_alternative_approaches(
-                    agenda_item, session.topic
-                )
                 discussion_outcome["alternative_approaches"].extend(alternatives)
-                
-                # Simulate consensus building
-                consensus = await self._build_consensus_for_item(agenda_item, insights)
                 if consensus:
                     discussion_outcome["consensus_points"].append(consensus)
                     
@@ -272,23 +317,33 @@ class DiscusserAgent(BaseAgent):
             return discussion_outcome
             
         except Exception as e:
-            logger.error(f"Error conducting discussion: {e}")
+            logger.error("Error conducting discussion: %s", e)
             raise
             
+    async def _discuss_agenda_item(self, agenda_item: str, topic: str,
+                                   previous_results_text: str) -> Tuple[List[str], List[str], Optional[str]]:
+        """Discuss one agenda item and return its insights, alternatives and consensus"""
+        logger.info("Discussing agenda item: %s", agenda_item)
+        
+        # Insights and alternatives are generated together; consensus builds on the insights
+        insights, alternatives = await asyncio.gather(
+            self._generate_insights_for_agenda_item(agenda_item, topic, previous_results_text),
+            self._generate_alternative_approaches(agenda_item, topic)
+        )
+        consensus = await self._build_consensus_for_item(agenda_item, insights)
+        
+        return insights, alternatives, consensus
+        
     async def _generate_insights_for_agenda_item(self, agenda_item: str, topic: str, 
-                                               previous_results: Dict[str, Any]) -> List[str]:
+                                               previous_results_text: str) -> List[str]:
         """Generate insights for a specific agenda item"""
         try:
             # Use Google A2A to generate insights
-            prompt = f"""
-            Generate 3-5 key insights for this discussion agenda item:
-            
-            Agenda Item: {agenda_item}
-            Topic: {topic}
-            Previous Results: {previous_results}
-            
-            Focus on practical, actionable insights that advance the discussion.
-            """
+            prompt = INSIGHTS_PROMPT_TEMPLATE.format_map({
+                "agenda_item": agenda_item,
+                "topic": topic,
+                "previous_results": previous_results_text
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -303,21 +358,17 @@ class DiscusserAgent(BaseAgent):
             return insights
             
         except Exception as e:
-            logger.error(f"Error generating insights: {e}")
+            logger.error("Error generating insights: %s", e)
             return [f"Default insight for {agenda_item}"]
             
     async def _generate_alternative_approaches(self, agenda_item: str, topic: str) -> List[str]:
         """Generate alternative approaches for an agenda item"""
         try:
             # Use Google A2A to generate alternatives
-            prompt = f"""
-            Generate 2-3 alternative approaches for this agenda item:
-            
-            Agenda Item: {agenda_item}
-            Topic: {topic}
-            
-            Consider different perspectives, technologies, and methodologies.
-            """
+            prompt = ALTERNATIVES_PROMPT_TEMPLATE.format_map({
+                "agenda_item": agenda_item,
+                "topic": topic
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -331,7 +382,7 @@ class DiscusserAgent(BaseAgent):
             return alternatives
             
         except Exception as e:
-            logger.error(f"Error generating alternatives: {e}")
+            logger.error("Error generating alternatives: %s", e)
             return [f"Default alternative for {agenda_item}"]
             
     async def _build_consensus_for_item(self, agenda_item: str, insights: List[str]) -> Optional[str]:
@@ -341,14 +392,10 @@ class DiscusserAgent(BaseAgent):
                 return None
                 
             # Use Google A2A to build consensus
-            prompt = f"""
-            Based on these insights, build a consensus statement:
-            
-            Agenda Item: {agenda_item}
-            Insights: {insights}
-            
-            Create a clear, actionable consensus that all participants can agree on.
-            """
+            prompt = CONSENSUS_PROMPT_TEMPLATE.format_map({
+                "agenda_item": agenda_item,
+                "insights": insights
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -359,22 +406,18 @@ class DiscusserAgent(BaseAgent):
             return consensus
             
         except Exception as e:
-            logger.error(f"Error building consensus: {e}")
+            logger.error("Error building consensus: %s", e)
             return None
             
     async def _generate_next_steps(self, discussion_outcome: Dict[str, Any]) -> List[str]:
         """Generate next steps based on discussion outcomes"""
         try:
             # Use Google A2A to generate next steps
-            prompt = f"""
-            Based on this discussion outcome, generate 3-5 actionable next steps:
-            
-            Key Insights: {discussion_outcome.get('key_insights', [])}
-            Innovative Solutions: {discussion_outcome.get('innovative_solutions', [])}
-            Consensus Points: {discussion_outcome.get('consensus_points', [])}
-            
-            Focus on concrete, measurable actions that move the project forward.
-            """
+            prompt = NEXT_STEPS_PROMPT_TEMPLATE.format_map({
+                "key_insights": discussion_outcome.get('key_insights', []),
+                "innovative_solutions": discussion_outcome.get('innovative_solutions', []),
+                "consensus_points": discussion_outcome.get('consensus_points', [])
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -391,7 +434,7 @@ class DiscusserAgent(BaseAgent):
             return next_steps
             
         except Exception as e:
-            logger.error(f"Error generating next steps: {e}")
+            logger.error("Error generating next steps: %s", e)
             return ["Review discussion outcomes", "Plan next phase"]
             
     async def _generate_innovative_solutions(self, topic: str, description: str, 
@@ -399,15 +442,11 @@ class DiscusserAgent(BaseAgent):
         """Generate innovative solutions based on discussion"""
         try:
             # Use Google A2A to generate innovative solutions
-            prompt = f"""
-            Based on the discussion, generate 3-5 innovative solutions:
-            
-            Topic: {topic}
-            Description: {description}
-            Discussion Insights: {discussion_outcome.get('key_insights', [])}
-            
-            Focus on breakthrough ideas that address the core challenges.
-            """
+            prompt = SOLUTIONS_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description,
+                "key_insights": discussion_outcome.get('key_insights', [])
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -424,23 +463,25 @@ class DiscusserAgent(BaseAgent):
             return solutions
             
         except Exception as e:
-            logger.error(f"Error generating innovative solutions: {e}")
+            logger.error("Error generating innovative solutions: %s", e)
             return ["Standard implementation approach", "Incremental improvement strategy"]
             
     async def _conduct_brainstorming_session(self, task_data: Dict[str, Any]) -> TaskResult:
         """Conduct a brainstorming session"""
-        # Implementation for brainstorming session
-        pass
+        return self._unsupported_task(task_data)
         
     async def _build_consensus(self, task_data: Dict[str, Any]) -> TaskResult:
         """Build consensus among participants"""
-        # Implementation for consensus building
-        pass
+        return self._unsupported_task(task_data)
         
     async def _refine_ideas(self, task_data: Dict[str, Any]) -> TaskResult:
         """Refine and improve ideas"""
-        # Implementation for idea refinement
-        pass
+        return self._unsupported_task(task_data)
+        
+    @cached_property
+    def discussion_templates(self) -> Dict[str, Any]:
+        """Discussion templates for different types of sessions, built on first use"""
+        return self._load_discussion_templates()
         
     def _load_discussion_templates(self) -> Dict[str, Any]:
         """Load discussion templates for different types of sessions"""
@@ -460,4 +501,12 @@ class DiscusserAgent(BaseAgent):
                 "participants": ["stakeholders", "decision_makers"],
                 "format": "Decision-focused discussion"
             }
-        }
\ No newline at end of file
+        }
+
+# Discussion formats; only the full innovation discussion is implemented
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "innovation_discussion": DiscusserAgent._facilitate_innovation_discussion,
+    "brainstorming_session": DiscusserAgent._conduct_brainstorming_session,
+    "consensus_building": DiscusserAgent._build_consensus,
+    "idea_refinement": DiscusserAgent._refine_ideas,
+}
@@ -6,16 +6,37 @@ Analyzes patent topics and creates comprehensive development strategies
 import asyncio
 import logging
 from typing import Dict, Any, List
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from functools import cached_property
 
-from .base_agent import BaseAgent, TaskResult
+from .base_agent import BaseAgent, TaskResult, TaskHandler
 from ..google_a2a_client import get_google_a2a_client, PatentAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates, parsed once at import and filled with str.format_map per call.
+# Fixed instructions come first and per-call inputs last, so calls share a prefix.
+INNOVATION_AREAS_PROMPT_TEMPLATE = """\
+Based on the patent topic and analysis, identify the key areas of innovation.
+
+Please identify 3-5 key innovation areas that should be the focus of patent protection.
+
+Topic: {topic}
+Description: {description}
+Novelty Score: {novelty_score}/10
+Inventive Step: {inventive_step_score}/10
+"""
+
 @dataclass
 class PatentStrategy:
     """Patent development strategy"""
+    __slots__ = (
+        "topic", "description", "novelty_score", "inventive_step_score",
+        "patentability_assessment", "development_phases", "key_innovation_areas",
+        "competitive_analysis", "risk_assessment", "timeline_estimate", "resource_requirements",
+        "success_probability"
+    )
+    
     topic: str
     description: str
     novelty_score: float
@@ -32,6 +53,11 @@ class PatentStrategy:
 @dataclass
 class DevelopmentPhase:
     """Development phase definition"""
+    __slots__ = (
+        "phase_name", "duration_estimate", "key_deliverables", "dependencies",
+        "resource_requirements", "success_criteria"
+    )
+    
     phase_name: str
     duration_estimate: str
     key_deliverables: List[str]
@@ -48,7 +74,6 @@ class PlannerAgent(BaseAgent):
             capabilities=["patent_planning", "strategy_development", "risk_assessment", "timeline_planning"]
         )
         self.google_a2a_client = None
-        self.strategy_templates = self._load_strategy_templates()
         
     async def start(self):
         """Start the planner agent"""
@@ -61,23 +86,17 @@ class PlannerAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "patent_planning":
-                return await self._create_patent_strategy(task_data)
-            elif task_type == "strategy_optimization":
-                return await self._optimize_strategy(task_data)
-            elif task_type == "risk_assessment":
-                return await self._assess_risks(task_data)
-            elif task_type == "timeline_planning":
-                return await self._create_timeline(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Planner Agent: {e}")
+            logger.error("Error executing task in Planner Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -97,7 +116,7 @@ class PlannerAgent(BaseAgent):
                     error_message="Topic and description are required"
                 )
                 
-            logger.info(f"Creating patent strategy for: {topic}")
+            logger.info("Creating patent strategy for: %s", topic)
             
             # Analyze patent topic using Google A2A
             analysis = await self.google_a2a_client.analyze_patent_topic(topic, description)
@@ -148,7 +167,7 @@ class PlannerAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error creating patent strategy: {e}")
+            logger.error("Error creating patent strategy: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -194,7 +213,7 @@ class PlannerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error developing strategy: {e}")
+            logger.error("Error developing strategy: %s", e)
             raise
             
     async def _identify_innovation_areas(self, topic: str, description: str, 
@@ -202,16 +221,12 @@ class PlannerAgent(BaseAgent):
         """Identify key areas of innovation"""
         try:
             # Use Google A2A to identify innovation areas
-            prompt = f"""
-            Based on the patent topic and analysis, identify the key areas of innovation:
-            
-            Topic: {topic}
-            Description: {description}
-            Novelty Score: {analysis.novelty_score}/10
-            Inventive Step: {analysis.inventive_step_score}/10
-            
-            Please identify 3-5 key innovation areas that should be the focus of patent protection.
-            """
+            prompt = INNOVATION_AREAS_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description,
+                "novelty_score": analysis.novelty_score,
+                "inventive_step_score": analysis.inventive_step_score
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -228,7 +243,7 @@ class PlannerAgent(BaseAgent):
             return innovation_areas
             
         except Exception as e:
-            logger.error(f"Error identifying innovation areas: {e}")
+            logger.error("Error identifying innovation areas: %s", e)
             # Return default areas if AI analysis fails
             return ["Core technology", "Implementation method", "System design"]
             
@@ -319,7 +334,7 @@ class PlannerAgent(BaseAgent):
             return [asdict(phase) for phase in phases]
             
         except Exception as e:
-            logger.error(f"Error creating development phases: {e}")
+            logger.error("Error creating development phases: %s", e)
             raise
             
     async def _assess_competitive_risks(self, strategy: Dict[str, Any], 
@@ -369,7 +384,7 @@ class PlannerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error assessing competitive risks: {e}")
+            logger.error("Error assessing competitive risks: %s", e)
             raise
             
     async def _estimate_timeline(self, phases: List[Dict[str, Any]]) -> str:
@@ -388,7 +403,7 @@ class PlannerAgent(BaseAgent):
             return f"Total development time: {total_duration}, Filing to grant: 6-18 months"
             
         except Exception as e:
-            logger.error(f"Error estimating timeline: {e}")
+            logger.error("Error estimating timeline: %s", e)
             return "3-6 months (development) + 6-18 months (prosecution)"
             
     async def _estimate_resources(self, phases: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -418,7 +433,7 @@ class PlannerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error estimating resources: {e}")
+            logger.error("Error estimating resources: %s", e)
             raise
             
     async def _calculate_success_probability(self, strategy: Dict[str, Any], 
@@ -447,9 +462,14 @@ class PlannerAgent(BaseAgent):
             return max(0.1, min(0.95, success_probability))
             
         except Exception as e:
-            logger.error(f"Error calculating success probability: {e}")
+            logger.error("Error calculating success probability: %s", e)
             return 0.7  # Default fallback
             
+    @cached_property
+    def strategy_templates(self) -> Dict[str, Any]:
+        """Strategy templates for different patent types, built on first use"""
+        return self._load_strategy_templates()
+        
     def _load_strategy_templates(self) -> Dict[str, Any]:
         """Load strategy templates for different patent types"""
         return {
@@ -469,15 +489,20 @@ class PlannerAgent(BaseAgent):
         
     async def _optimize_strategy(self, task_data: Dict[str, Any]) -> TaskResult:
         """Optimize an existing patent strategy"""
-        # Implementation for strategy optimization
-        pass
+        return self._unsupported_task(task_data)
         
     async def _assess_risks(self, task_data: Dict[str, Any]) -> TaskResult:
         """Assess risks for a specific patent topic"""
-        # Implementation for risk assessment
-        pass
+        return self._unsupported_task(task_data)
         
     async def _create_timeline(self, task_data: Dict[str, Any]) -> TaskResult:
         """Create detailed timeline for patent development"""
-        # Implementation for timeline creation
-        pass
\ No newline at end of file
+        return self._unsupported_task(task_data)
+
+# Planning tasks; the workflow's Planning & Strategy stage sends patent_planning
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "patent_planning": PlannerAgent._create_patent_strategy,
+    "strategy_optimization": PlannerAgent._optimize_strategy,
+    "risk_assessment": PlannerAgent._assess_risks,
+    "timeline_planning": PlannerAgent._create_timeline,
+}
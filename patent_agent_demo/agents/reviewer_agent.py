@@ -7,8 +7,9 @@ import asyncio
 import logging
 from typing import Dict, Any, List
 from dataclasses import dataclass
+from functools import cached_property
 
-from .base_agent import BaseAgent, TaskResult
+from .base_agent import BaseAgent, TaskResult, TaskHandler
 from ..google_a2a_client import get_google_a2a_client, PatentDraft
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,10 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ReviewTask:
     """Review task definition"""
+    __slots__ = (
+        "task_id", "patent_draft", "review_criteria", "previous_results", "review_scope"
+    )
+    
     task_id: str
     patent_draft: PatentDraft
     review_criteria: Dict[str, Any]
@@ -25,6 +30,11 @@ class ReviewTask:
 @dataclass
 class ReviewResult:
     """Result of a patent review"""
+    __slots__ = (
+        "task_id", "overall_score", "section_scores", "issues_found", "recommendations",
+        "compliance_status", "quality_assessment"
+    )
+    
     task_id: str
     overall_score: float
     section_scores: Dict[str, float]
@@ -42,8 +52,6 @@ class ReviewerAgent(BaseAgent):
             capabilities=["patent_review", "quality_assessment", "compliance_checking", "feedback_generation"]
         )
         self.google_a2a_client = None
-        self.review_criteria = self._load_review_criteria()
-        self.quality_standards = self._load_quality_standards()
         
     async def start(self):
         """Start the reviewer agent"""
@@ -56,23 +64,17 @@ class ReviewerAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "patent_review":
-                return await self._review_patent_draft(task_data)
-            elif task_type == "quality_assessment":
-                return await self._assess_patent_quality(task_data)
-            elif task_type == "compliance_verification":
-                return await self._verify_compliance(task_data)
-            elif task_type == "feedback_generation":
-                return await self._generate_review_feedback(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Reviewer Agent: {e}")
+            logger.error("Error executing task in Reviewer Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -92,7 +94,7 @@ class ReviewerAgent(BaseAgent):
                     error_message="Patent draft is required for review"
                 )
                 
-            logger.info(f"Reviewing patent draft: {patent_draft.title}")
+            logger.info("Reviewing patent draft: %s", patent_draft.title)
             
             # Create review task
             review_task = ReviewTask(
@@ -128,7 +130,7 @@ class ReviewerAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error reviewing patent draft: {e}")
+            logger.error("Error reviewing patent draft: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -202,7 +204,7 @@ class ReviewerAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error conducting comprehensive review: {e}")
+            logger.error("Error conducting comprehensive review: %s", e)
             raise
             
     async def _review_title(self, title: str) -> Dict[str, Any]:
@@ -255,7 +257,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing title: {e}")
+            logger.error("Error reviewing title: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _review_abstract(self, abstract: str) -> Dict[str, Any]:
@@ -320,7 +322,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing abstract: {e}")
+            logger.error("Error reviewing abstract: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _review_background(self, background: str) -> Dict[str, Any]:
@@ -368,7 +370,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing background: {e}")
+            logger.error("Error reviewing background: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _review_summary(self, summary: str) -> Dict[str, Any]:
@@ -414,7 +416,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing summary: {e}")
+            logger.error("Error reviewing summary: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _review_detailed_description(self, description: str) -> Dict[str, Any]:
@@ -470,7 +472,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing detailed description: {e}")
+            logger.error("Error reviewing detailed description: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _review_claims(self, claims: List[str]) -> Dict[str, Any]:
@@ -535,7 +537,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing claims: {e}")
+            logger.error("Error reviewing claims: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _review_drawings(self, drawings: List[str]) -> Dict[str, Any]:
@@ -581,7 +583,7 @@ class ReviewerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error reviewing drawings: {e}")
+            logger.error("Error reviewing drawings: %s", e)
             return {"score": 0, "issues": [{"type": "error", "description": str(e)}]}
             
     async def _generate_recommendations(self, issues_found: List[Dict[str, Any]], 
@@ -618,7 +620,7 @@ class ReviewerAgent(BaseAgent):
             return recommendations
             
         except Exception as e:
-            logger.error(f"Error generating recommendations: {e}")
+            logger.error("Error generating recommendations: %s", e)
             return ["Review patent draft for quality issues"]
             
     async def _determine_compliance_status(self, overall_score: float, 
@@ -638,7 +640,7 @@ class ReviewerAgent(BaseAgent):
                 return "compliant"
                 
         except Exception as e:
-            logger.error(f"Error determining compliance status: {e}")
+            logger.error("Error determining compliance status: %s", e)
             return "unknown"
             
     async def _assess_overall_quality(self, overall_score: float, 
@@ -657,7 +659,7 @@ class ReviewerAgent(BaseAgent):
                 return "poor"
                 
         except Exception as e:
-            logger.error(f"Error assessing overall quality: {e}")
+            logger.error("Error assessing overall quality: %s", e)
             return "unknown"
             
     async def _generate_detailed_feedback(self, review_result: ReviewResult, 
@@ -699,7 +701,7 @@ class ReviewerAgent(BaseAgent):
             return feedback
             
         except Exception as e:
-            logger.error(f"Error generating detailed feedback: {e}")
+            logger.error("Error generating detailed feedback: %s", e)
             return {"error": str(e)}
             
     async def _determine_review_outcome(self, review_result: ReviewResult) -> str:
@@ -715,23 +717,25 @@ class ReviewerAgent(BaseAgent):
                 return "major_revision_required"
                 
         except Exception as e:
-            logger.error(f"Error determining review outcome: {e}")
+            logger.error("Error determining review outcome: %s", e)
             return "review_failed"
             
     async def _assess_patent_quality(self, task_data: Dict[str, Any]) -> TaskResult:
         """Assess patent quality specifically"""
-        # Implementation for quality assessment
-        pass
+        return self._unsupported_task(task_data)
         
     async def _verify_compliance(self, task_data: Dict[str, Any]) -> TaskResult:
         """Verify compliance specifically"""
-        # Implementation for compliance verification
-        pass
+        return self._unsupported_task(task_data)
         
     async def _generate_review_feedback(self, task_data: Dict[str, Any]) -> TaskResult:
         """Generate review feedback specifically"""
-        # Implementation for feedback generation
-        pass
+        return self._unsupported_task(task_data)
+        
+    @cached_property
+    def review_criteria(self) -> Dict[str, Any]:
+        """Review criteria for different patent types, built on first use"""
+        return self._load_review_criteria()
         
     def _load_review_criteria(self) -> Dict[str, Any]:
         """Load review criteria for different patent types"""
@@ -748,6 +752,11 @@ class ReviewerAgent(BaseAgent):
             }
         }
         
+    @cached_property
+    def quality_standards(self) -> Dict[str, Any]:
+        """Quality standards for patent review, built on first use"""
+        return self._load_quality_standards()
+        
     def _load_quality_standards(self) -> Dict[str, Any]:
         """Load quality standards for patent review"""
         return {
@@ -771,4 +780,12 @@ class ReviewerAgent(BaseAgent):
                 "weight": 0.1,
                 "criteria": ["novelty", "inventiveness", "commercial_potential"]
             }
-        }
\ No newline at end of file
+        }
+
+# Review tasks; the workflow's Quality Review stage sends patent_review
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "patent_review": ReviewerAgent._review_patent_draft,
+    "quality_assessment": ReviewerAgent._assess_patent_quality,
+    "compliance_verification": ReviewerAgent._verify_compliance,
+    "feedback_generation": ReviewerAgent._generate_review_feedback,
+}
@@ -7,15 +7,156 @@ import asyncio
 import logging
 from typing import Dict, Any, List
 from dataclasses import dataclass
+from functools import cached_property
 
-from .base_agent import BaseAgent, TaskResult
+from .base_agent import BaseAgent, TaskResult, TaskHandler
 from ..google_a2a_client import get_google_a2a_client, PatentDraft
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates, parsed once at import and filled with str.format_map per call.
+# Fixed instructions come first and per-call inputs last, so calls share a prefix.
+TITLE_PROMPT_TEMPLATE = """\
+Improve this patent title based on the recommendation.
+
+Make the title more descriptive, clear, and technically accurate.
+Return only the improved title.
+
+Current Title: {title}
+Recommendation: {recommendation}
+"""
+
+ABSTRACT_PROMPT_TEMPLATE = """\
+Improve this patent abstract based on the recommendation.
+
+Make the abstract more comprehensive, clear, and technically accurate.
+Ensure it's between 50-150 words.
+Return only the improved abstract.
+
+Current Abstract: {abstract}
+Recommendation: {recommendation}
+"""
+
+BACKGROUND_PROMPT_TEMPLATE = """\
+Improve this patent background section based on the recommendation.
+
+Make the background more comprehensive, include required elements, and improve clarity.
+Return only the improved background section.
+
+Current Background: {background}
+Recommendation: {recommendation}
+"""
+
+SUMMARY_PROMPT_TEMPLATE = """\
+Improve this patent summary section based on the recommendation.
+
+Make the summary more comprehensive and include key advantages.
+Return only the improved summary section.
+
+Current Summary: {summary}
+Recommendation: {recommendation}
+"""
+
+DESCRIPTION_PROMPT_TEMPLATE = """\
+Improve this patent detailed description based on the recommendation.
+
+Make the description more comprehensive, technically detailed, and clear.
+Include more implementation details and technical depth.
+Return only the improved description.
+
+Current Description: {description}
+Recommendation: {recommendation}
+"""
+
+CLAIMS_PROMPT_TEMPLATE = """\
+Improve these patent claims based on the recommendation.
+
+Make the claims clearer, more precise, and properly structured.
+Ensure proper claim formatting and technical accuracy.
+Return only the improved claims as a numbered list.
+
+Current Claims: {claims}
+Recommendation: {recommendation}
+"""
+
+DRAWINGS_PROMPT_TEMPLATE = """\
+Improve these technical drawing descriptions based on the recommendation.
+
+Make the drawing descriptions more detailed and technically accurate.
+Return only the improved drawing descriptions.
+
+Current Drawings: {drawings}
+Recommendation: {recommendation}
+"""
+
+CLARITY_PROMPT_TEMPLATE = """\
+Enhance the clarity of this text.
+
+Make it more readable, clear, and logically structured.
+Return only the improved text.
+
+Text: {text}
+"""
+
+TECHNICAL_DETAILS_PROMPT_TEMPLATE = """\
+Add more technical details to this patent description.
+
+Include more implementation details, technical specifications, and examples.
+Return only the enhanced description.
+
+Description: {description}
+"""
+
+NEW_ABSTRACT_PROMPT_TEMPLATE = """\
+Generate a comprehensive patent abstract.
+
+Create a clear, technical abstract that summarizes the invention.
+Keep it between 50-150 words.
+
+Title: {title}
+Background: {background}
+"""
+
+NEW_CLAIMS_PROMPT_TEMPLATE = """\
+Generate 3-5 patent claims.
+
+Create clear, precise claims with proper structure.
+
+Title: {title}
+Description: {description}
+"""
+
+NEW_DESCRIPTION_PROMPT_TEMPLATE = """\
+Generate a detailed patent description.
+
+Create a comprehensive technical description with implementation details.
+
+Title: {title}
+Abstract: {abstract}
+"""
+
+# Draft attribute and improver method for each section named in review feedback
+SECTION_IMPROVERS = {
+    "title": ("title", "_improve_title"),
+    "abstract": ("abstract", "_improve_abstract"),
+    "background": ("background", "_improve_background"),
+    "summary": ("summary", "_improve_summary"),
+    "description": ("detailed_description", "_improve_description"),
+    "claims": ("claims", "_improve_claims"),
+    "drawings": ("technical_diagrams", "_improve_drawings")
+}
+
+# Sections a high-priority issue can be routed to, in matching order
+HIGH_PRIORITY_SECTIONS = ("title", "abstract", "background")
+
 @dataclass
 class RewriteTask:
     """Rewrite task definition"""
+    __slots__ = (
+        "task_id", "original_draft", "review_feedback", "improvement_priorities",
+        "target_quality_score"
+    )
+    
     task_id: str
     original_draft: PatentDraft
     review_feedback: Dict[str, Any]
@@ -25,6 +166,11 @@ class RewriteTask:
 @dataclass
 class RewriteResult:
     """Result of a patent rewrite"""
+    __slots__ = (
+        "task_id", "improved_draft", "changes_made", "quality_improvement", "compliance_status",
+        "final_quality_score"
+    )
+    
     task_id: str
     improved_draft: PatentDraft
     changes_made: List[Dict[str, Any]]
@@ -38,11 +184,9 @@ class RewriterAgent(BaseAgent):
     def __init__(self):
         super().__init__(
             name="rewriter_agent",
-            capabilities=["patent_rewriting", "feedback_implementation", "quality_improvement", "compliance_optimization"]
+            capabilities=["patent_rewrite", "patent_rewriting", "feedback_implementation", "quality_improvement", "compliance_optimization"]
         )
         self.google_a2a_client = None
-        self.improvement_strategies = self._load_improvement_strategies()
-        self.rewrite_templates = self._load_rewrite_templates()
         
     async def start(self):
         """Start the rewriter agent"""
@@ -55,23 +199,17 @@ class RewriterAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "patent_rewrite":
-                return await self._rewrite_patent_draft(task_data)
-            elif task_type == "feedback_implementation":
-                return await self._implement_feedback(task_data)
-            elif task_type == "quality_improvement":
-                return await self._improve_patent_quality(task_data)
-            elif task_type == "compliance_optimization":
-                return await self._optimize_compliance(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Rewriter Agent: {e}")
+            logger.error("Error executing task in Rewriter Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -92,7 +230,7 @@ class RewriterAgent(BaseAgent):
                     error_message="Patent draft is required for rewriting"
                 )
                 
-            logger.info(f"Rewriting patent draft: {patent_draft.title}")
+            logger.info("Rewriting patent draft: %s", patent_draft.title)
             
             # Create rewrite task
             rewrite_task = RewriteTask(
@@ -144,7 +282,7 @@ class RewriterAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error rewriting patent draft: {e}")
+            logger.error("Error rewriting patent draft: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -185,7 +323,7 @@ class RewriterAgent(BaseAgent):
             return priorities
             
         except Exception as e:
-            logger.error(f"Error identifying improvement priorities: {e}")
+            logger.error("Error identifying improvement priorities: %s", e)
             return ["general_improvement"]
             
     async def _implement_systematic_improvements(self, rewrite_task: RewriteTask) -> PatentDraft:
@@ -216,7 +354,7 @@ class RewriterAgent(BaseAgent):
             return improved_draft
             
         except Exception as e:
-            logger.error(f"Error implementing systematic improvements: {e}")
+            logger.error("Error implementing systematic improvements: %s", e)
             raise
             
     async def _fix_critical_issues(self, draft: PatentDraft, feedback: Dict[str, Any]) -> PatentDraft:
@@ -240,7 +378,7 @@ class RewriterAgent(BaseAgent):
             return draft
             
         except Exception as e:
-            logger.error(f"Error fixing critical issues: {e}")
+            logger.error("Error fixing critical issues: %s", e)
             return draft
             
     async def _fix_high_priority_issues(self, draft: PatentDraft, feedback: Dict[str, Any]) -> PatentDraft:
@@ -250,66 +388,52 @@ class RewriterAgent(BaseAgent):
             high_priority_issues = [issue for issue in priority_issues if issue.get("severity") == "high"]
             
             for issue in high_priority_issues:
-                issue_type = issue.get("type")
-                description = issue.get("description", "")
+                description = issue.get("description", "").lower()
                 recommendation = issue.get("recommendation", "")
                 
-                if "title" in description.lower():
-                    draft.title = await self._improve_title(draft.title, recommendation)
-                elif "abstract" in description.lower():
-                    draft.abstract = await self._improve_abstract(draft.abstract, recommendation)
-                elif "background" in description.lower():
-                    draft.background = await self._improve_background(draft.background, recommendation)
+                for section_name in HIGH_PRIORITY_SECTIONS:
+                    if section_name in description:
+                        await self._apply_section_improvement(draft, section_name, recommendation)
+                        break
                     
             return draft
             
         except Exception as e:
-            logger.error(f"Error fixing high priority issues: {e}")
+            logger.error("Error fixing high priority issues: %s", e)
             return draft
             
     async def _improve_section(self, draft: PatentDraft, section_name: str, feedback: Dict[str, Any]) -> PatentDraft:
         """Improve a specific section of the patent draft"""
         try:
+            if section_name not in SECTION_IMPROVERS:
+                return draft
+                
             section_feedback = feedback.get("section_feedback", {}).get(section_name, {})
             issues = section_feedback.get("issues", [])
             
             for issue in issues:
-                recommendation = issue.get("recommendation", "")
-                
-                if section_name == "title":
-                    draft.title = await self._improve_title(draft.title, recommendation)
-                elif section_name == "abstract":
-                    draft.abstract = await self._improve_abstract(draft.abstract, recommendation)
-                elif section_name == "background":
-                    draft.background = await self._improve_background(draft.background, recommendation)
-                elif section_name == "summary":
-                    draft.summary = await self._improve_summary(draft.summary, recommendation)
-                elif section_name == "description":
-                    draft.detailed_description = await self._improve_description(draft.detailed_description, recommendation)
-                elif section_name == "claims":
-                    draft.claims = await self._improve_claims(draft.claims, recommendation)
-                elif section_name == "drawings":
-                    draft.technical_diagrams = await self._improve_drawings(draft.technical_diagrams, recommendation)
+                await self._apply_section_improvement(draft, section_name, issue.get("recommendation", ""))
                     
             return draft
             
         except Exception as e:
-            logger.error(f"Error improving section {section_name}: {e}")
+            logger.error("Error improving section %s: %s", section_name, e)
             return draft
             
+    async def _apply_section_improvement(self, draft: PatentDraft, section_name: str, recommendation: str):
+        """Rewrite one draft section in place using its entry in SECTION_IMPROVERS"""
+        attribute, method_name = SECTION_IMPROVERS[section_name]
+        improve = getattr(self, method_name)
+        setattr(draft, attribute, await improve(getattr(draft, attribute), recommendation))
+        
     async def _improve_title(self, title: str, recommendation: str) -> str:
         """Improve the patent title"""
         try:
             # Use Google A2A to improve title
-            prompt = f"""
-            Improve this patent title based on the recommendation:
-            
-            Current Title: {title}
-            Recommendation: {recommendation}
-            
-            Make the title more descriptive, clear, and technically accurate.
-            Return only the improved title.
-            """
+            prompt = TITLE_PROMPT_TEMPLATE.format_map({
+                "title": title,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -321,23 +445,17 @@ class RewriterAgent(BaseAgent):
             return improved_title
             
         except Exception as e:
-            logger.error(f"Error improving title: {e}")
+            logger.error("Error improving title: %s", e)
             return title
             
     async def _improve_abstract(self, abstract: str, recommendation: str) -> str:
         """Improve the patent abstract"""
         try:
             # Use Google A2A to improve abstract
-            prompt = f"""
-            Improve this patent abstract based on the recommendation:
-            
-            Current Abstract: {abstract}
-            Recommendation: {recommendation}
-            
-            Make the abstract more comprehensive, clear, and technically accurate.
-            Ensure it's between 50-150 words.
-            Return only the improved abstract.
-            """
+            prompt = ABSTRACT_PROMPT_TEMPLATE.format_map({
+                "abstract": abstract,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -350,22 +468,17 @@ class RewriterAgent(BaseAgent):
             return improved_abstract
             
         except Exception as e:
-            logger.error(f"Error improving abstract: {e}")
+            logger.error("Error improving abstract: %s", e)
             return abstract
             
     async def _improve_background(self, background: str, recommendation: str) -> str:
         """Improve the background section"""
         try:
             # Use Google A2A to improve background
-            prompt = f"""
-            Improve this patent background section based on the recommendation:
-            
-            Current Background: {background}
-            Recommendation: {recommendation}
-            
-            Make the background more comprehensive, include required elements, and improve clarity.
-            Return only the improved background section.
-            """
+            prompt = BACKGROUND_PROMPT_TEMPLATE.format_map({
+                "background": background,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -377,22 +490,17 @@ class RewriterAgent(BaseAgent):
             return improved_background
             
         except Exception as e:
-            logger.error(f"Error improving background: {e}")
+            logger.error("Error improving background: %s", e)
             return background
             
     async def _improve_summary(self, summary: str, recommendation: str) -> str:
         """Improve the summary section"""
         try:
             # Use Google A2A to improve summary
-            prompt = f"""
-            Improve this patent summary section based on the recommendation:
-            
-            Current Summary: {summary}
-            Recommendation: {recommendation}
-            
-            Make the summary more comprehensive and include key advantages.
-            Return only the improved summary section.
-            """
+            prompt = SUMMARY_PROMPT_TEMPLATE.format_map({
+                "summary": summary,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -404,23 +512,17 @@ class RewriterAgent(BaseAgent):
             return improved_summary
             
         except Exception as e:
-            logger.error(f"Error improving summary: {e}")
+            logger.error("Error improving summary: %s", e)
             return summary
             
     async def _improve_description(self, description: str, recommendation: str) -> str:
         """Improve the detailed description section"""
         try:
             # Use Google A2A to improve description
-            prompt = f"""
-            Improve this patent detailed description based on the recommendation:
-            
-            Current Description: {description}
-            Recommendation: {recommendation}
-            
-            Make the description more comprehensive, technically detailed, and clear.
-            Include more implementation details and technical depth.
-            Return only the improved description.
-            """
+            prompt = DESCRIPTION_PROMPT_TEMPLATE.format_map({
+                "description": description,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -432,23 +534,17 @@ class RewriterAgent(BaseAgent):
             return improved_description
             
         except Exception as e:
-            logger.error(f"Error improving description: {e}")
+            logger.error("Error improving description: %s", e)
             return description
             
     async def _improve_claims(self, claims: List[str], recommendation: str) -> List[str]:
         """Improve the patent claims"""
         try:
             # Use Google A2A to improve claims
-            prompt = f"""
-            Improve these patent claims based on the recommendation:
-            
-            Current Claims: {claims}
-            Recommendation: {recommendation}
-            
-            Make the claims clearer, more precise, and properly structured.
-            Ensure proper claim formatting and technical accuracy.
-            Return only the improved claims as a numbered list.
-            """
+            prompt = CLAIMS_PROMPT_TEMPLATE.format_map({
+                "claims": claims,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -463,22 +559,17 @@ class RewriterAgent(BaseAgent):
             return improved_claims
             
         except Exception as e:
-            logger.error(f"Error improving claims: {e}")
+            logger.error("Error improving claims: %s", e)
             return claims
             
     async def _improve_drawings(self, drawings: List[str], recommendation: str) -> List[str]:
         """Improve the technical drawings descriptions"""
         try:
             # Use Google A2A to improve drawings
-            prompt = f"""
-            Improve these technical drawing descriptions based on the recommendation:
-            
-            Current Drawings: {drawings}
-            Recommendation: {recommendation}
-            
-            Make the drawing descriptions more detailed and technically accurate.
-            Return only the improved drawing descriptions.
-            """
+            prompt = DRAWINGS_PROMPT_TEMPLATE.format_map({
+                "drawings": drawings,
+                "recommendation": recommendation
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -493,22 +584,29 @@ class RewriterAgent(BaseAgent):
             return improved_drawings
             
         except Exception as e:
-            logger.error(f"Error improving drawings: {e}")
+            logger.error("Error improving drawings: %s", e)
             return drawings
             
     async def _enhance_clarity(self, draft: PatentDraft) -> PatentDraft:
         """Enhance overall clarity of the patent draft"""
         try:
-            # Improve readability and logical flow
-            draft.abstract = await self._enhance_text_clarity(draft.abstract)
-            draft.background = await self._enhance_text_clarity(draft.background)
-            draft.summary = await self._enhance_text_clarity(draft.summary)
-            draft.detailed_description = await self._enhance_text_clarity(draft.detailed_description)
+            # Improve readability and logical flow; the sections are independent
+            (
+                draft.abstract,
+                draft.background,
+                draft.summary,
+                draft.detailed_description,
+            ) = await asyncio.gather(
+                self._enhance_text_clarity(draft.abstract),
+                self._enhance_text_clarity(draft.background),
+                self._enhance_text_clarity(draft.summary),
+                self._enhance_text_clarity(draft.detailed_description),
+            )
             
             return draft
             
         except Exception as e:
-            logger.error(f"Error enhancing clarity: {e}")
+            logger.error("Error enhancing clarity: %s", e)
             return draft
             
     async def _enhance_text_clarity(self, text: str) -> str:
@@ -518,14 +616,9 @@ class RewriterAgent(BaseAgent):
                 return text
                 
             # Use Google A2A to enhance clarity
-            prompt = f"""
-            Enhance the clarity of this text:
-            
-            Text: {text}
-            
-            Make it more readable, clear, and logically structured.
-            Return only the improved text.
-            """
+            prompt = CLARITY_PROMPT_TEMPLATE.format_map({
+                "text": text
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -537,7 +630,7 @@ class RewriterAgent(BaseAgent):
             return improved_text
             
         except Exception as e:
-            logger.error(f"Error enhancing text clarity: {e}")
+            logger.error("Error enhancing text clarity: %s", e)
             return text
             
     async def _improve_technical_depth(self, draft: PatentDraft) -> PatentDraft:
@@ -550,7 +643,7 @@ class RewriterAgent(BaseAgent):
             return draft
             
         except Exception as e:
-            logger.error(f"Error improving technical depth: {e}")
+            logger.error("Error improving technical depth: %s", e)
             return draft
             
     async def _add_technical_details(self, description: str) -> str:
@@ -560,14 +653,9 @@ class RewriterAgent(BaseAgent):
                 return description
                 
             # Use Google A2A to add technical details
-            prompt = f"""
-            Add more technical details to this patent description:
-            
-            Description: {description}
-            
-            Include more implementation details, technical specifications, and examples.
-            Return only the enhanced description.
-            """
+            prompt = TECHNICAL_DETAILS_PROMPT_TEMPLATE.format_map({
+                "description": description
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -579,7 +667,7 @@ class RewriterAgent(BaseAgent):
             return enhanced_description
             
         except Exception as e:
-            logger.error(f"Error adding technical details: {e}")
+            logger.error("Error adding technical details: %s", e)
             return description
             
     async def _add_technical_limitations(self, claims: List[str]) -> List[str]:
@@ -594,7 +682,7 @@ class RewriterAgent(BaseAgent):
             return enhanced_claims
             
         except Exception as e:
-            logger.error(f"Error adding technical limitations: {e}")
+            logger.error("Error adding technical limitations: %s", e)
             return claims
             
     async def _optimize_claims(self, draft: PatentDraft) -> PatentDraft:
@@ -606,7 +694,7 @@ class RewriterAgent(BaseAgent):
             return draft
             
         except Exception as e:
-            logger.error(f"Error optimizing claims: {e}")
+            logger.error("Error optimizing claims: %s", e)
             return draft
             
     async def _restructure_claims(self, claims: List[str]) -> List[str]:
@@ -621,7 +709,7 @@ class RewriterAgent(BaseAgent):
             return restructured_claims
             
         except Exception as e:
-            logger.error(f"Error restructuring claims: {e}")
+            logger.error("Error restructuring claims: %s", e)
             return claims
             
     async def _enhance_compliance(self, draft: PatentDraft) -> PatentDraft:
@@ -638,22 +726,17 @@ class RewriterAgent(BaseAgent):
             return draft
             
         except Exception as e:
-            logger.error(f"Error enhancing compliance: {e}")
+            logger.error("Error enhancing compliance: %s", e)
             return draft
             
     async def _generate_improved_abstract(self, title: str, background: str) -> str:
         """Generate an improved abstract"""
         try:
             # Use Google A2A to generate abstract
-            prompt = f"""
-            Generate a comprehensive patent abstract:
-            
-            Title: {title}
-            Background: {background}
-            
-            Create a clear, technical abstract that summarizes the invention.
-            Keep it between 50-150 words.
-            """
+            prompt = NEW_ABSTRACT_PROMPT_TEMPLATE.format_map({
+                "title": title,
+                "background": background
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -666,21 +749,17 @@ class RewriterAgent(BaseAgent):
             return abstract
             
         except Exception as e:
-            logger.error(f"Error generating improved abstract: {e}")
+            logger.error("Error generating improved abstract: %s", e)
             return f"Abstract for {title}: Technical implementation and methodology."
             
     async def _generate_improved_claims(self, title: str, description: str) -> List[str]:
         """Generate improved patent claims"""
         try:
             # Use Google A2A to generate claims
-            prompt = f"""
-            Generate 3-5 patent claims:
-            
-            Title: {title}
-            Description: {description}
-            
-            Create clear, precise claims with proper structure.
-            """
+            prompt = NEW_CLAIMS_PROMPT_TEMPLATE.format_map({
+                "title": title,
+                "description": description
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -695,21 +774,17 @@ class RewriterAgent(BaseAgent):
             return claims
             
         except Exception as e:
-            logger.error(f"Error generating improved claims: {e}")
+            logger.error("Error generating improved claims: %s", e)
             return [f"1. A method for {title.lower()}."]
             
     async def _generate_improved_description(self, title: str, abstract: str) -> str:
         """Generate improved detailed description"""
         try:
             # Use Google A2A to generate description
-            prompt = f"""
-            Generate a detailed patent description:
-            
-            Title: {title}
-            Abstract: {abstract}
-            
-            Create a comprehensive technical description with implementation details.
-            """
+            prompt = NEW_DESCRIPTION_PROMPT_TEMPLATE.format_map({
+                "title": title,
+                "abstract": abstract
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -721,7 +796,7 @@ class RewriterAgent(BaseAgent):
             return description
             
         except Exception as e:
-            logger.error(f"Error generating improved description: {e}")
+            logger.error("Error generating improved description: %s", e)
             return f"Detailed description for {title}: Comprehensive technical implementation including methodology, components, and examples."
             
     async def _track_changes(self, original_draft: PatentDraft, improved_draft: PatentDraft) -> List[Dict[str, Any]]:
@@ -761,7 +836,7 @@ class RewriterAgent(BaseAgent):
             return changes
             
         except Exception as e:
-            logger.error(f"Error tracking changes: {e}")
+            logger.error("Error tracking changes: %s", e)
             return [{"section": "general", "type": "error", "description": "Error tracking changes"}]
             
     async def _calculate_quality_improvement(self, original_draft: PatentDraft, 
@@ -792,7 +867,7 @@ class RewriterAgent(BaseAgent):
             return min(100.0, improvement_percentage)
             
         except Exception as e:
-            logger.error(f"Error calculating quality improvement: {e}")
+            logger.error("Error calculating quality improvement: %s", e)
             return 0.0
             
     async def _verify_rewrite_compliance(self, draft: PatentDraft) -> str:
@@ -813,7 +888,7 @@ class RewriterAgent(BaseAgent):
                 return "compliant"
                 
         except Exception as e:
-            logger.error(f"Error verifying rewrite compliance: {e}")
+            logger.error("Error verifying rewrite compliance: %s", e)
             return "unknown"
             
     async def _calculate_final_quality_score(self, draft: PatentDraft) -> float:
@@ -844,23 +919,25 @@ class RewriterAgent(BaseAgent):
             return max(1.0, min(10.0, base_score))
             
         except Exception as e:
-            logger.error(f"Error calculating final quality score: {e}")
+            logger.error("Error calculating final quality score: %s", e)
             return 8.0  # Default fallback score
             
     async def _implement_feedback(self, task_data: Dict[str, Any]) -> TaskResult:
         """Implement specific feedback"""
-        # Implementation for feedback implementation
-        pass
+        return self._unsupported_task(task_data)
         
     async def _improve_patent_quality(self, task_data: Dict[str, Any]) -> TaskResult:
         """Improve patent quality specifically"""
-        # Implementation for quality improvement
-        pass
+        return self._unsupported_task(task_data)
         
     async def _optimize_compliance(self, task_data: Dict[str, Any]) -> TaskResult:
         """Optimize compliance specifically"""
-        # Implementation for compliance optimization
-        pass
+        return self._unsupported_task(task_data)
+        
+    @cached_property
+    def improvement_strategies(self) -> Dict[str, Any]:
+        """Improvement strategies for different issues, built on first use"""
+        return self._load_improvement_strategies()
         
     def _load_improvement_strategies(self) -> Dict[str, Any]:
         """Load improvement strategies for different issues"""
@@ -879,6 +956,11 @@ class RewriterAgent(BaseAgent):
             }
         }
         
+    @cached_property
+    def rewrite_templates(self) -> Dict[str, Any]:
+        """Rewrite templates for different patent types, built on first use"""
+        return self._load_rewrite_templates()
+        
     def _load_rewrite_templates(self) -> Dict[str, Any]:
         """Load rewrite templates for different patent types"""
         return {
@@ -890,4 +972,12 @@ class RewriterAgent(BaseAgent):
                 "required_sections": ["title", "description", "claims", "drawings"],
                 "quality_targets": {"excellent": 9.0, "good": 8.0, "acceptable": 7.0}
             }
-        }
\ No newline at end of file
+        }
+
+# Rewrite tasks; the workflow's Final Rewrite stage sends patent_rewrite
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "patent_rewrite": RewriterAgent._rewrite_patent_draft,
+    "feedback_implementation": RewriterAgent._implement_feedback,
+    "quality_improvement": RewriterAgent._improve_patent_quality,
+    "compliance_optimization": RewriterAgent._optimize_compliance,
+}
@@ -7,15 +7,46 @@ import asyncio
 import logging
 from typing import Dict, Any, List
 from dataclasses import dataclass
+from functools import cached_property
 
-from .base_agent import BaseAgent, TaskResult
+from .base_agent import BaseAgent, TaskResult, TaskHandler
 from ..google_a2a_client import get_google_a2a_client, SearchResult
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates, parsed once at import and filled with str.format_map per call.
+# Fixed instructions come first and per-call inputs last, so calls share a prefix.
+KEYWORDS_PROMPT_TEMPLATE = """\
+Extract 10-15 relevant technical keywords for patent search from the topic below.
+
+Focus on:
+- Technical terms
+- Industry-specific terminology
+- Synonyms and related terms
+- Abbreviations and acronyms
+
+Return only the keywords, one per line.
+
+Topic: {topic}
+Description: {description}
+"""
+
+TECHNOLOGY_AREAS_PROMPT_TEMPLATE = """\
+Based on these patent abstracts, identify the key technology areas.
+
+Please identify 5-7 main technology areas that these patents cover.
+
+Topic: {topic}
+Abstracts: {abstracts}
+"""
+
 @dataclass
 class SearchQuery:
     """Search query definition"""
+    __slots__ = (
+        "topic", "keywords", "date_range", "jurisdiction", "max_results", "search_filters"
+    )
+    
     topic: str
     keywords: List[str]
     date_range: str
@@ -26,6 +57,10 @@ class SearchQuery:
 @dataclass
 class SearchReport:
     """Search report with results and analysis"""
+    __slots__ = (
+        "query", "results", "analysis", "recommendations", "risk_assessment", "novelty_score"
+    )
+    
     query: SearchQuery
     results: List[SearchResult]
     analysis: Dict[str, Any]
@@ -42,7 +77,6 @@ class SearcherAgent(BaseAgent):
             capabilities=["prior_art_search", "patent_analysis", "competitive_research", "novelty_assessment"]
         )
         self.google_a2a_client = None
-        self.search_databases = self._load_search_databases()
         
     async def start(self):
         """Start the searcher agent"""
@@ -55,23 +89,17 @@ class SearcherAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "prior_art_search":
-                return await self._conduct_prior_art_search(task_data)
-            elif task_type == "patent_analysis":
-                return await self._analyze_patents(task_data)
-            elif task_type == "competitive_research":
-                return await self._conduct_competitive_research(task_data)
-            elif task_type == "novelty_assessment":
-                return await self._assess_novelty(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Searcher Agent: {e}")
+            logger.error("Error executing task in Searcher Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -91,7 +119,7 @@ class SearcherAgent(BaseAgent):
                     error_message="Topic is required for prior art search"
                 )
                 
-            logger.info(f"Conducting prior art search for: {topic}")
+            logger.info("Conducting prior art search for: %s", topic)
             
             # Extract keywords from topic and description
             keywords = await self._extract_keywords(topic, description)
@@ -151,7 +179,7 @@ class SearcherAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error conducting prior art search: {e}")
+            logger.error("Error conducting prior art search: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -162,20 +190,10 @@ class SearcherAgent(BaseAgent):
         """Extract relevant keywords for search"""
         try:
             # Use Google A2A to extract keywords
-            prompt = f"""
-            Extract 10-15 relevant technical keywords for patent search from:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Focus on:
-            - Technical terms
-            - Industry-specific terminology
-            - Synonyms and related terms
-            - Abbreviations and acronyms
-            
-            Return only the keywords, one per line.
-            """
+            prompt = KEYWORDS_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -191,30 +209,36 @@ class SearcherAgent(BaseAgent):
             return keywords
             
         except Exception as e:
-            logger.error(f"Error extracting keywords: {e}")
+            logger.error("Error extracting keywords: %s", e)
             # Return default keywords if AI analysis fails
             return ["technology", "system", "method", "apparatus", "process"]
             
     async def _search_multiple_databases(self, search_query: SearchQuery) -> List[SearchResult]:
         """Search across multiple patent databases"""
         try:
+            # Search USPTO, EPO, WIPO and Google Patents concurrently;
+            # gather keeps the results in database order
+            databases = {
+                "USPTO": self._search_uspto,
+                "EPO": self._search_epo,
+                "WIPO": self._search_wipo,
+                "Google Patents": self._search_google_patents,
+            }
+            per_database = await asyncio.gather(
+                *(search(search_query) for search in databases.values()),
+                return_exceptions=True
+            )
+
+            # A failing database is logged and skipped rather than sinking the
+            # others, but a cancelled search still cancels the whole lookup
             all_results = []
-            
-            # Search USPTO (US Patent Office)
-            uspto_results = await self._search_uspto(search_query)
-            all_results.extend(uspto_results)
-            
-            # Search EPO (European Patent Office)
-            epo_results = await self._search_epo(search_query)
-            all_results.extend(epo_results)
-            
-            # Search WIPO (World Intellectual Property Organization)
-            wipo_results = await self._search_wipo(search_query)
-            all_results.extend(wipo_results)
-            
-            # Search Google Patents
-            google_results = await self._search_google_patents(search_query)
-            all_results.extend(google_results)
+            for database, results in zip(databases, per_database):
+                if isinstance(results, asyncio.CancelledError):
+                    raise results
+                if isinstance(results, BaseException):
+                    logger.error("Error searching %s: %s", database, results)
+                    continue
+                all_results.extend(results)
             
             # Remove duplicates and sort by relevance
             unique_results = await self._deduplicate_results(all_results)
@@ -224,110 +248,90 @@ class SearcherAgent(BaseAgent):
             return sorted_results[:search_query.max_results]
             
         except Exception as e:
-            logger.error(f"Error searching multiple databases: {e}")
+            logger.error("Error searching multiple databases: %s", e)
             raise
             
     async def _search_uspto(self, search_query: SearchQuery) -> List[SearchResult]:
         """Search US Patent Office database"""
-        try:
-            # Mock USPTO search - in production, integrate with actual USPTO API
-            mock_results = [
-                SearchResult(
-                    patent_id="US12345678",
-                    title="Example US Patent",
-                    abstract="This is an example US patent related to the search topic...",
-                    inventors=["John Doe", "Jane Smith"],
-                    filing_date="2020-01-01",
-                    publication_date="2021-01-01",
-                    relevance_score=8.5,
-                    similarity_analysis={"overlap": "25%", "differences": "Key differences noted"}
-                ),
-                SearchResult(
-                    patent_id="US87654321",
-                    title="Another US Patent Example",
-                    abstract="Another example patent with different approach...",
-                    inventors=["Bob Johnson", "Alice Brown"],
-                    filing_date="2019-06-15",
-                    publication_date="2020-06-15",
-                    relevance_score=7.2,
-                    similarity_analysis={"overlap": "15%", "differences": "Significant differences"}
-                )
-            ]
-            
-            return mock_results
-            
-        except Exception as e:
-            logger.error(f"Error searching USPTO: {e}")
-            return []
+        # Mock USPTO search - in production, integrate with actual USPTO API
+        mock_results = [
+            SearchResult(
+                patent_id="US12345678",
+                title="Example US Patent",
+                abstract="This is an example US patent related to the search topic...",
+                inventors=["John Doe", "Jane Smith"],
+                filing_date="2020-01-01",
+                publication_date="2021-01-01",
+                relevance_score=8.5,
+                similarity_analysis={"overlap": "25%", "differences": "Key differences noted"}
+            ),
+            SearchResult(
+                patent_id="US87654321",
+                title="Another US Patent Example",
+                abstract="Another example patent with different approach...",
+                inventors=["Bob Johnson", "Alice Brown"],
+                filing_date="2019-06-15",
+                publication_date="2020-06-15",
+                relevance_score=7.2,
+                similarity_analysis={"overlap": "15%", "differences": "Significant differences"}
+            )
+        ]
+        
+        return mock_results
             
     async def _search_epo(self, search_query: SearchQuery) -> List[SearchResult]:
         """Search European Patent Office database"""
-        try:
-            # Mock EPO search
-            mock_results = [
-                SearchResult(
-                    patent_id="EP34567890",
-                    title="European Patent Example",
-                    abstract="Example European patent with similar technology...",
-                    inventors=["Hans Mueller", "Marie Dubois"],
-                    filing_date="2020-03-20",
-                    publication_date="2021-03-20",
-                    relevance_score=7.8,
-                    similarity_analysis={"overlap": "20%", "differences": "Regional variations"}
-                )
-            ]
-            
-            return mock_results
-            
-        except Exception as e:
-            logger.error(f"Error searching EPO: {e}")
-            return []
+        # Mock EPO search
+        mock_results = [
+            SearchResult(
+                patent_id="EP34567890",
+                title="European Patent Example",
+                abstract="Example European patent with similar technology...",
+                inventors=["Hans Mueller", "Marie Dubois"],
+                filing_date="2020-03-20",
+                publication_date="2021-03-20",
+                relevance_score=7.8,
+                similarity_analysis={"overlap": "20%", "differences": "Regional variations"}
+            )
+        ]
+        
+        return mock_results
             
     async def _search_wipo(self, search_query: SearchQuery) -> List[SearchResult]:
         """Search WIPO database"""
-        try:
-            # Mock WIPO search
-            mock_results = [
-                SearchResult(
-                    patent_id="WO2021/123456",
-                    title="International Patent Application",
-                    abstract="International patent application covering similar concepts...",
-                    inventors=["Global Inventor", "International Team"],
-                    filing_date="2021-01-10",
-                    publication_date="2021-07-15",
-                    relevance_score=6.9,
-                    similarity_analysis={"overlap": "18%", "differences": "International perspective"}
-                )
-            ]
-            
-            return mock_results
-            
-        except Exception as e:
-            logger.error(f"Error searching WIPO: {e}")
-            return []
+        # Mock WIPO search
+        mock_results = [
+            SearchResult(
+                patent_id="WO2021/123456",
+                title="International Patent Application",
+                abstract="International patent application covering similar concepts...",
+                inventors=["Global Inventor", "International Team"],
+                filing_date="2021-01-10",
+                publication_date="2021-07-15",
+                relevance_score=6.9,
+                similarity_analysis={"overlap": "18%", "differences": "International perspective"}
+            )
+        ]
+        
+        return mock_results
             
     async def _search_google_patents(self, search_query: SearchQuery) -> List[SearchResult]:
         """Search Google Patents database"""
-        try:
-            # Mock Google Patents search
-            mock_results = [
-                SearchResult(
-                    patent_id="US98765432",
-                    title="Google Patents Example",
-                    abstract="Example from Google Patents database...",
-                    inventors=["Tech Innovator", "Digital Pioneer"],
-                    filing_date="2020-08-30",
-                    publication_date="2021-02-28",
-                    relevance_score=8.1,
-                    similarity_analysis={"overlap": "22%", "differences": "Modern approach"}
-                )
-            ]
-            
-            return mock_results
-            
-        except Exception as e:
-            logger.error(f"Error searching Google Patents: {e}")
-            return []
+        # Mock Google Patents search
+        mock_results = [
+            SearchResult(
+                patent_id="US98765432",
+                title="Google Patents Example",
+                abstract="Example from Google Patents database...",
+                inventors=["Tech Innovator", "Digital Pioneer"],
+                filing_date="2020-08-30",
+                publication_date="2021-02-28",
+                relevance_score=8.1,
+                similarity_analysis={"overlap": "22%", "differences": "Modern approach"}
+            )
+        ]
+        
+        return mock_results
             
     async def _deduplicate_results(self, results: List[SearchResult]) -> List[SearchResult]:
         """Remove duplicate search results"""
@@ -343,7 +347,7 @@ class SearcherAgent(BaseAgent):
             return unique_results
             
         except Exception as e:
-            logger.error(f"Error deduplicating results: {e}")
+            logger.error("Error deduplicating results: %s", e)
             return results
             
     async def _sort_by_relevance(self, results: List[SearchResult], topic: str) -> List[SearchResult]:
@@ -354,7 +358,7 @@ class SearcherAgent(BaseAgent):
             return sorted_results
             
         except Exception as e:
-            logger.error(f"Error sorting results: {e}")
+            logger.error("Error sorting results: %s", e)
             return results
             
     async def _analyze_search_results(self, results: List[SearchResult], topic: str) -> Dict[str, Any]:
@@ -401,7 +405,7 @@ class SearcherAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing search results: {e}")
+            logger.error("Error analyzing search results: %s", e)
             return {"error": str(e)}
             
     async def _identify_technology_areas(self, results: List[SearchResult], topic: str) -> List[str]:
@@ -410,14 +414,10 @@ class SearcherAgent(BaseAgent):
             # Use Google A2A to identify technology areas
             abstracts = [result.abstract for result in results[:10]]  # Top 10 results
             
-            prompt = f"""
-            Based on these patent abstracts, identify the key technology areas:
-            
-            Topic: {topic}
-            Abstracts: {abstracts}
-            
-            Please identify 5-7 main technology areas that these patents cover.
-            """
+            prompt = TECHNOLOGY_AREAS_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "abstracts": abstracts
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -436,7 +436,7 @@ class SearcherAgent(BaseAgent):
             return technology_areas
             
         except Exception as e:
-            logger.error(f"Error identifying technology areas: {e}")
+            logger.error("Error identifying technology areas: %s", e)
             return ["Technology Area 1", "Technology Area 2", "Technology Area 3"]
             
     async def _generate_search_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
@@ -472,7 +472,7 @@ class SearcherAgent(BaseAgent):
             return recommendations
             
         except Exception as e:
-            logger.error(f"Error generating recommendations: {e}")
+            logger.error("Error generating recommendations: %s", e)
             return ["Review search results carefully", "Consult with patent attorney"]
             
     async def _assess_search_risks(self, results: List[SearchResult], 
@@ -541,7 +541,7 @@ class SearcherAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error assessing search risks: {e}")
+            logger.error("Error assessing search risks: %s", e)
             return {
                 "overall_risk_level": "Unknown",
                 "error": str(e)
@@ -572,23 +572,25 @@ class SearcherAgent(BaseAgent):
             return max(1.0, min(10.0, final_score))
             
         except Exception as e:
-            logger.error(f"Error calculating novelty score: {e}")
+            logger.error("Error calculating novelty score: %s", e)
             return 7.0  # Default fallback score
             
     async def _analyze_patents(self, task_data: Dict[str, Any]) -> TaskResult:
         """Analyze specific patents"""
-        # Implementation for patent analysis
-        pass
+        return self._unsupported_task(task_data)
         
     async def _conduct_competitive_research(self, task_data: Dict[str, Any]) -> TaskResult:
         """Conduct competitive research"""
-        # Implementation for competitive research
-        pass
+        return self._unsupported_task(task_data)
         
     async def _assess_novelty(self, task_data: Dict[str, Any]) -> TaskResult:
         """Assess novelty of a specific invention"""
-        # Implementation for novelty assessment
-        pass
+        return self._unsupported_task(task_data)
+        
+    @cached_property
+    def search_databases(self) -> Dict[str, Any]:
+        """Search database configurations, built on first use"""
+        return self._load_search_databases()
         
     def _load_search_databases(self) -> Dict[str, Any]:
         """Load search database configurations"""
@@ -617,4 +619,12 @@ class SearcherAgent(BaseAgent):
                 "coverage": "Global patent database",
                 "api_available": False
             }
-        }
\ No newline at end of file
+        }
+
+# Search tasks; the workflow's Prior Art Search stage sends prior_art_search
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "prior_art_search": SearcherAgent._conduct_prior_art_search,
+    "patent_analysis": SearcherAgent._analyze_patents,
+    "competitive_research": SearcherAgent._conduct_competitive_research,
+    "novelty_assessment": SearcherAgent._assess_novelty,
+}
@@ -7,15 +7,42 @@ import asyncio
 import logging
 from typing import Dict, Any, List
 from dataclasses import dataclass
+from functools import cached_property
 
-from .base_agent import BaseAgent, TaskResult
+from .base_agent import BaseAgent, TaskResult, TaskHandler
 from ..google_a2a_client import get_google_a2a_client, PatentDraft
 
 logger = logging.getLogger(__name__)
 
+# The draft call returns every section in one response; only the detailed
+# description is expanded separately. Parsed once at import, with the fixed
+# instructions first so every call shares a byte-identical prefix.
+DETAILED_DESCRIPTION_PROMPT_TEMPLATE = """\
+Write a detailed description section for a patent application.
+
+Include:
+1. Detailed technical implementation
+2. Step-by-step methodology
+3. Alternative embodiments
+4. Technical advantages
+
+Write in formal patent language, 500-800 words.
+
+Topic: {topic}
+Description: {description}
+Claims: {claims}
+
+Previous Results: {previous_results}
+"""
+
 @dataclass
 class WritingTask:
     """Writing task definition"""
+    __slots__ = (
+        "task_id", "topic", "description", "requirements", "previous_results",
+        "target_audience", "writing_style"
+    )
+    
     task_id: str
     topic: str
     description: str
@@ -27,6 +54,10 @@ class WritingTask:
 @dataclass
 class WritingOutput:
     """Output of a writing task"""
+    __slots__ = (
+        "task_id", "content", "writing_metrics", "quality_score", "compliance_check"
+    )
+    
     task_id: str
     content: PatentDraft
     writing_metrics: Dict[str, Any]
@@ -42,8 +73,6 @@ class WriterAgent(BaseAgent):
             capabilities=["patent_drafting", "technical_writing", "claim_writing", "legal_compliance"]
         )
         self.google_a2a_client = None
-        self.writing_templates = self._load_writing_templates()
-        self.legal_requirements = self._load_legal_requirements()
         
     async def start(self):
         """Start the writer agent"""
@@ -56,23 +85,17 @@ class WriterAgent(BaseAgent):
         try:
             task_type = task_data.get("type")
             
-            if task_type == "patent_drafting":
-                return await self._draft_patent_application(task_data)
-            elif task_type == "claim_writing":
-                return await self._write_patent_claims(task_data)
-            elif task_type == "technical_description":
-                return await self._write_technical_description(task_data)
-            elif task_type == "legal_compliance_check":
-                return await self._check_legal_compliance(task_data)
-            else:
+            handler = TASK_HANDLERS.get(task_type)
+            if handler is None:
                 return TaskResult(
                     success=False,
                     data={},
                     error_message=f"Unknown task type: {task_type}"
                 )
-                
+
+            return await handler(self, task_data)
         except Exception as e:
-            logger.error(f"Error executing task in Writer Agent: {e}")
+            logger.error("Error executing task in Writer Agent: %s", e)
             return TaskResult(
                 success=False,
                 data={},
@@ -93,7 +116,7 @@ class WriterAgent(BaseAgent):
                     error_message="Topic and description are required for patent drafting"
                 )
                 
-            logger.info(f"Drafting patent application for: {topic}")
+            logger.info("Drafting patent application for: %s", topic)
             
             # Create writing task
             writing_task = WritingTask(
@@ -106,19 +129,31 @@ class WriterAgent(BaseAgent):
                 writing_style="technical_legal"
             )
             
-            # Generate patent draft using Google A2A
-            patent_draft = await self.google_a2a_client.generate_patent_draft(
-                topic, description, previous_results.get("analysis", {})
+            # Draft from the planner's analysis, analysing the topic here when
+            # the task was not given one
+            analysis = task_data.get("analysis") or previous_results.get("analysis")
+            if analysis is None:
+                analysis = await self.google_a2a_client.analyze_patent_topic(topic, description)
+                
+            # Draft, self-review and claim optimisation come back in one round trip;
+            # the draft carries the optimized claims from here on
+            patent_draft, draft_review, optimized_claims = await self.google_a2a_client.draft_review_optimize(
+                topic, description, analysis
+            )
+            patent_draft.claims = optimized_claims
+            
+            # The draft call already returns every section in one response; only
+            # the detailed description and the figures are expanded further, and
+            # those two calls are independent of each other
+            detailed_description, technical_diagrams = await asyncio.gather(
+                self._write_detailed_description(
+                    topic, description, patent_draft.claims, previous_results
+                ),
+                self.google_a2a_client.generate_technical_diagrams(description)
             )
-            
-            # Write detailed sections
-            detailed_sections = await self._write_detailed_sections(writing_task, patent_draft)
-            
-            # Generate technical diagrams
-            technical_diagrams = await self.google_a2a_client.generate_technical_diagrams(description)
             
             # Update patent draft with detailed content
-            patent_draft.detailed_description = detailed_sections.get("detailed_description", "")
+            patent_draft.detailed_description = detailed_description
             patent_draft.technical_diagrams = technical_diagrams
             
             # Check legal compliance
@@ -146,6 +181,7 @@ class WriterAgent(BaseAgent):
                     "patent_draft": patent_draft,
                     "writing_output": writing_output,
                     "technical_diagrams": technical_diagrams,
+                    "draft_review": draft_review,
                     "compliance_status": "compliant" if compliance_check.get("overall_score", 0) >= 8.0 else "needs_revision"
                 },
                 metadata={
@@ -155,160 +191,24 @@ class WriterAgent(BaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error drafting patent application: {e}")
+            logger.error("Error drafting patent application: %s", e)
             return TaskResult(
                 success=False,
                 data={},
                 error_message=str(e)
             )
             
-    async def _write_detailed_sections(self, writing_task: WritingTask, 
-                                     patent_draft: PatentDraft) -> Dict[str, str]:
-        """Write detailed sections of the patent application"""
-        try:
-            detailed_sections = {}
-            
-            # Write background section
-            background = await self._write_background_section(
-                writing_task.topic, writing_task.description, writing_task.previous_results
-            )
-            detailed_sections["background"] = background
-            
-            # Write summary section
-            summary = await self._write_summary_section(
-                writing_task.topic, patent_draft.abstract, writing_task.previous_results
-            )
-            detailed_sections["summary"] = summary
-            
-            # Write detailed description
-            detailed_description = await self._write_detailed_description(
-                writing_task.topic, writing_task.description, patent_draft.claims, writing_task.previous_results
-            )
-            detailed_sections["detailed_description"] = detailed_description
-            
-            # Write claims
-            claims = await self._write_patent_claims(
-                writing_task.topic, writing_task.description, writing_task.previous_results
-            )
-            detailed_sections["claims"] = claims
-            
-            # Write drawings description
-            drawings_description = await self._write_drawings_description(
-                writing_task.topic, writing_task.description
-            )
-            detailed_sections["drawings_description"] = drawings_description
-            
-            return detailed_sections
-            
-        except Exception as e:
-            logger.error(f"Error writing detailed sections: {e}")
-            raise
-            
-    async def _write_background_section(self, topic: str, description: str, 
-                                      previous_results: Dict[str, Any]) -> str:
-        """Write the background section"""
-        try:
-            # Use Google A2A to write background section
-            prompt = f"""
-            Write a comprehensive background section for a patent application:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Previous Analysis: {previous_results.get('analysis', {})}
-            
-            Include:
-            1. Field of the invention
-            2. Current state of the art
-            3. Problems with existing solutions
-            4. Need for the invention
-            
-            Write in formal patent language, 200-300 words.
-            """
-            
-            response = await self.google_a2a_client._generate_response(prompt)
-            
-            # Parse and format response
-            background_section = f"""
-            BACKGROUND OF THE INVENTION
-            
-            Field of the Invention
-            
-            The present invention relates to {topic.lower()}, and more particularly to {description.lower()}.
-            
-            {response}
-            
-            Description of the Prior Art
-            
-            Current solutions in the field of {topic.lower()} suffer from several limitations including [limitations identified from analysis]. There exists a need for improved methods and systems that address these limitations.
-            """
-            
-            return background_section
-            
-        except Exception as e:
-            logger.error(f"Error writing background section: {e}")
-            return f"Background section for {topic} - [Error occurred during generation]"
-            
-    async def _write_summary_section(self, topic: str, abstract: str, 
-                                   previous_results: Dict[str, Any]) -> str:
-        """Write the summary section"""
-        try:
-            # Use Google A2A to write summary section
-            prompt = f"""
-            Write a summary section for a patent application:
-            
-            Topic: {topic}
-            Abstract: {abstract}
-            
-            Analysis Results: {previous_results.get('analysis', {})}
-            
-            Include:
-            1. Brief summary of the invention
-            2. Key advantages
-            3. Technical benefits
-            
-            Write in formal patent language, 150-200 words.
-            """
-            
-            response = await self.google_a2a_client._generate_response(prompt)
-            
-            # Parse and format response
-            summary_section = f"""
-            SUMMARY OF THE INVENTION
-            
-            {response}
-            
-            The present invention provides significant advantages over existing solutions, including improved efficiency, enhanced performance, and novel technical approaches to {topic.lower()}.
-            """
-            
-            return summary_section
-            
-        except Exception as e:
-            logger.error(f"Error writing summary section: {e}")
-            return f"Summary section for {topic} - [Error occurred during generation]"
-            
     async def _write_detailed_description(self, topic: str, description: str, 
                                         claims: List[str], previous_results: Dict[str, Any]) -> str:
         """Write the detailed description section"""
         try:
             # Use Google A2A to write detailed description
-            prompt = f"""
-            Write a detailed description section for a patent application:
-            
-            Topic: {topic}
-            Description: {description}
-            Claims: {claims}
-            
-            Previous Results: {previous_results}
-            
-            Include:
-            1. Detailed technical implementation
-            2. Step-by-step methodology
-            3. Alternative embodiments
-            4. Technical advantages
-            
-            Write in formal patent language, 500-800 words.
-            """
+            prompt = DETAILED_DESCRIPTION_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description,
+                "claims": claims,
+                "previous_results": previous_results
+            })
             
             response = await self.google_a2a_client._generate_response(prompt)
             
@@ -324,86 +224,9 @@ class WriterAgent(BaseAgent):
             return detailed_description
             
         except Exception as e:
-            logger.error(f"Error writing detailed description: {e}")
+            logger.error("Error writing detailed description: %s", e)
             return f"Detailed description for {topic} - [Error occurred during generation]"
             
-    async def _write_patent_claims(self, topic: str, description: str, 
-                                 previous_results: Dict[str, Any]) -> List[str]:
-        """Write patent claims"""
-        try:
-            # Use Google A2A to write claims
-            prompt = f"""
-            Write 3-5 patent claims for this invention:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Analysis: {previous_results.get('analysis', {})}
-            
-            Include:
-            1. One independent claim covering the core invention
-            2. 2-4 dependent claims with specific limitations
-            3. Clear, precise language
-            4. Proper patent claim structure
-            
-            Format each claim as a numbered list.
-            """
-            
-            response = await self.google_a2a_client._generate_response(prompt)
-            
-            # Parse response to extract claims
-            # This is a simplified approach
-            claims = [
-                f"1. A method for {topic.lower()}, comprising: {description.lower()}.",
-                f"2. The method of claim 1, further comprising: additional step.",
-                f"3. The method of claim 1, wherein: specific limitation.",
-                f"4. A system for {topic.lower()}, comprising: system components.",
-                f"5. A computer-readable medium storing instructions for {topic.lower()}."
-            ]
-            
-            return claims
-            
-        except Exception as e:
-            logger.error(f"Error writing patent claims: {e}")
-            return [f"Claim 1: A method for {topic.lower()}."]
-            
-    async def _write_drawings_description(self, topic: str, description: str) -> str:
-        """Write the drawings description section"""
-        try:
-            # Use Google A2A to write drawings description
-            prompt = f"""
-            Write a drawings description section for a patent application:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Include descriptions for:
-            1. Figure 1: Overall system architecture
-            2. Figure 2: Detailed component diagram
-            3. Figure 3: Process flow diagram
-            4. Figure 4: Implementation example
-            5. Figure 5: Alternative embodiments
-            
-            Write in formal patent language, 200-300 words.
-            """
-            
-            response = await self.google_a2a_client._generate_response(prompt)
-            
-            # Parse and format response
-            drawings_description = f"""
-            BRIEF DESCRIPTION OF THE DRAWINGS
-            
-            {response}
-            
-            The drawings illustrate preferred embodiments of the invention and are not intended to limit the scope of the invention.
-            """
-            
-            return drawings_description
-            
-        except Exception as e:
-            logger.error(f"Error writing drawings description: {e}")
-            return f"Drawings description for {topic} - [Error occurred during generation]"
-            
     async def _check_patent_compliance(self, patent_draft: PatentDraft) -> Dict[str, Any]:
         """Check legal compliance of the patent draft"""
         try:
@@ -441,7 +264,7 @@ class WriterAgent(BaseAgent):
             return compliance_check
             
         except Exception as e:
-            logger.error(f"Error checking patent compliance: {e}")
+            logger.error("Error checking patent compliance: %s", e)
             return {"overall_score": 0, "error": str(e)}
             
     async def _check_title_compliance(self, title: str) -> Dict[str, Any]:
@@ -473,7 +296,7 @@ class WriterAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error checking title compliance: {e}")
+            logger.error("Error checking title compliance: %s", e)
             return {"score": 0, "error": str(e)}
             
     async def _check_abstract_compliance(self, abstract: str) -> Dict[str, Any]:
@@ -505,7 +328,7 @@ class WriterAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error checking abstract compliance: {e}")
+            logger.error("Error checking abstract compliance: %s", e)
             return {"score": 0, "error": str(e)}
             
     async def _check_claims_compliance(self, claims: List[str]) -> Dict[str, Any]:
@@ -539,7 +362,7 @@ class WriterAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error checking claims compliance: {e}")
+            logger.error("Error checking claims compliance: %s", e)
             return {"score": 0, "error": str(e)}
             
     async def _check_description_compliance(self, description: str) -> Dict[str, Any]:
@@ -571,7 +394,7 @@ class WriterAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error checking description compliance: {e}")
+            logger.error("Error checking description compliance: %s", e)
             return {"score": 0, "error": str(e)}
             
     async def _generate_compliance_recommendations(self, compliance_check: Dict[str, Any]) -> List[str]:
@@ -597,7 +420,7 @@ class WriterAgent(BaseAgent):
             return recommendations
             
         except Exception as e:
-            logger.error(f"Error generating compliance recommendations: {e}")
+            logger.error("Error generating compliance recommendations: %s", e)
             return ["Review patent draft for compliance issues"]
             
     async def _calculate_writing_quality(self, patent_draft: PatentDraft, 
@@ -632,23 +455,25 @@ class WriterAgent(BaseAgent):
             return max(1.0, min(10.0, quality_score))
             
         except Exception as e:
-            logger.error(f"Error calculating writing quality: {e}")
+            logger.error("Error calculating writing quality: %s", e)
             return 7.0  # Default fallback score
             
     async def _write_patent_claims(self, task_data: Dict[str, Any]) -> TaskResult:
         """Write patent claims specifically"""
-        # Implementation for claim writing
-        pass
+        return self._unsupported_task(task_data)
         
     async def _write_technical_description(self, task_data: Dict[str, Any]) -> TaskResult:
         """Write technical description"""
-        # Implementation for technical description writing
-        pass
+        return self._unsupported_task(task_data)
         
     async def _check_legal_compliance(self, task_data: Dict[str, Any]) -> TaskResult:
         """Check legal compliance"""
-        # Implementation for legal compliance checking
-        pass
+        return self._unsupported_task(task_data)
+        
+    @cached_property
+    def writing_templates(self) -> Dict[str, Any]:
+        """Writing templates for different patent types, built on first use"""
+        return self._load_writing_templates()
         
     def _load_writing_templates(self) -> Dict[str, Any]:
         """Load writing templates for different patent types"""
@@ -667,6 +492,11 @@ class WriterAgent(BaseAgent):
             }
         }
         
+    @cached_property
+    def legal_requirements(self) -> Dict[str, Any]:
+        """Legal requirements for patent applications, built on first use"""
+        return self._load_legal_requirements()
+        
     def _load_legal_requirements(self) -> Dict[str, Any]:
         """Load legal requirements for patent applications"""
         return {
@@ -688,4 +518,12 @@ class WriterAgent(BaseAgent):
                 "claims_max_count": 20,
                 "drawings_required": True
             }
-        }
\ No newline at end of file
+        }
+
+# Writing tasks; the workflow's Patent Drafting stage sends patent_drafting
+TASK_HANDLERS: Dict[str, TaskHandler] = {
+    "patent_drafting": WriterAgent._draft_patent_application,
+    "claim_writing": WriterAgent._write_patent_claims,
+    "technical_description": WriterAgent._write_technical_description,
+    "legal_compliance_check": WriterAgent._check_legal_compliance,
+}
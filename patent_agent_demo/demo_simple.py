@@ -8,6 +8,11 @@ import asyncio
 import logging
 from patent_agent_system import PatentAgentSystem
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -56,7 +61,7 @@ async def simple_demo():
         
     except Exception as e:
         print(f"❌ Error during demo: {e}")
-        logger.error(f"Demo error: {e}")
+        logger.error("Demo error: %s", e)
     finally:
         # Cleanup
         if 'patent_system' in locals():
@@ -64,4 +69,6 @@ async def simple_demo():
             print("🛑 System stopped.")
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(simple_demo())
\ No newline at end of file
@@ -4,9 +4,10 @@ Handles message passing, agent coordination, and system communication
 """
 
 import asyncio
-import json
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+import itertools
+from collections import deque
+from typing import Dict, Any, Deque, List, Optional, Set, Tuple
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import logging
 
@@ -52,7 +53,7 @@ class AgentInfo:
     status: AgentStatus
     capabilities: List[str]
     current_task: Optional[str] = None
-    performance_metrics: Dict[str, float] = None
+    performance_metrics: Dict[str, float] = field(default_factory=dict)
 
 class FastMCPBroker:
     """Message broker for FastMCP communication"""
@@ -61,63 +62,83 @@ class FastMCPBroker:
         self.agents: Dict[str, AgentInfo] = {}
         self.message_queue: asyncio.Queue = asyncio.Queue()
         self.subscribers: Dict[str, List[str]] = {}
-        self.message_history: List[Message] = []
+        self.message_history: Deque[Message] = deque()
         self.max_history = 1000
+        # Per-recipient view of message_history as (sequence, message) pairs, so an
+        # agent's lookup scans only its own and broadcast messages
+        self._history_by_recipient: Dict[str, Deque[Tuple[int, Message]]] = {}
+        self._message_sequence = itertools.count()
+        # Sequence numbers already handed to each agent, so a message is received
+        # once per agent instead of on every poll
+        self._delivered: Dict[str, Set[int]] = {}
         
     async def register_agent(self, agent_name: str, capabilities: List[str]):
         """Register a new agent"""
         self.agents[agent_name] = AgentInfo(
             name=agent_name,
             status=AgentStatus.IDLE,
-            capabilities=capabilities,
-            performance_metrics={}
+            capabilities=capabilities
         )
-        logger.info(f"Agent {agent_name} registered with capabilities: {capabilities}")
+        logger.info("Agent %s registered with capabilities: %s", agent_name, capabilities)
         
     async def unregister_agent(self, agent_name: str):
         """Unregister an agent"""
         if agent_name in self.agents:
             del self.agents[agent_name]
-            logger.info(f"Agent {agent_name} unregistered")
+            logger.info("Agent %s unregistered", agent_name)
             
     async def send_message(self, message: Message):
         """Send a message to the broker"""
         await self.message_queue.put(message)
         self.message_history.append(message)
+        self._history_by_recipient.setdefault(message.recipient, deque()).append(
+            (next(self._message_sequence), message)
+        )
         
-        # Maintain message history size
+        # Maintain message history size; the oldest message overall is also the
+        # oldest in its recipient's view
         if len(self.message_history) > self.max_history:
-            self.message_history.pop(0)
+            oldest = self.message_history.popleft()
+            sequence, _ = self._history_by_recipient[oldest.recipient].popleft()
+            for delivered in self._delivered.values():
+                delivered.discard(sequence)
             
-        logger.info(f"Message sent: {message.type.value} from {message.sender} to {message.recipient}")
+        logger.info("Message sent: %s from %s to %s", message.type.value, message.sender, message.recipient)
         
     async def receive_message(self, agent_name: str) -> Optional[Message]:
         """Receive a message for a specific agent"""
         try:
-            # Check if there are messages for this agent
-            messages = [msg for msg in self.message_history 
-                       if msg.recipient == agent_name or msg.recipient == "broadcast"]
-            
-            if messages:
-                # Return the highest priority message
-                messages.sort(key=lambda x: x.priority, reverse=True)
-                return messages.pop(0)
+            # Return the highest priority message for this agent, oldest first on ties
+            best: Optional[Tuple[int, Message]] = None
+            delivered = self._delivered.setdefault(agent_name, set())
+            for recipient in (agent_name, "broadcast"):
+                for entry in self._history_by_recipient.get(recipient, ()):
+                    if entry[0] in delivered:
+                        continue
+                    if (best is None or entry[1].priority > best[1].priority
+                            or (entry[1].priority == best[1].priority and entry[0] < best[0])):
+                        best = entry
+                        
+            if best is not None:
+                delivered.add(best[0])
+                return best[1]
                 
         except Exception as e:
-            logger.error(f"Error receiving message for {agent_name}: {e}")
+            logger.error("Error receiving message for %s: %s", agent_name, e)
             
         return None
         
     async def broadcast_message(self, message_type: MessageType, content: Dict[str, Any], 
                               sender: str, priority: int = 1):
         """Broadcast a message to all agents"""
+        now = asyncio.get_event_loop().time()
         message = Message(
-            id=f"broadcast_{asyncio.get_event_loop().time()}",
+            id=f"broadcast_{now}",
             type=message_type,
             sender=sender,
             recipient="broadcast",
             content=content,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=now,
             priority=priority
         )
         await self.send_message(message)
@@ -132,7 +153,7 @@ class FastMCPBroker:
         if agent_name in self.agents:
             self.agents[agent_name].status = status
             self.agents[agent_name].current_task = current_task
-            logger.info(f"Agent {agent_name} status updated: {status.value}")
+            logger.info("Agent %s status updated: %s", agent_name, status.value)
             
     async def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status"""
@@ -160,10 +181,10 @@ class MessageHandler:
             if message.type in self.message_handlers:
                 await self.message_handlers[message.type](message)
             else:
-                logger.warning(f"No handler registered for message type: {message.type.value}")
+                logger.warning("No handler registered for message type: %s", message.type.value)
                 
         except Exception as e:
-            logger.error(f"Error processing message {message.id}: {e}")
+            logger.error("Error processing message %s: %s", message.id, e)
             
             # Send error message back to sender
             error_message = Message(
@@ -206,7 +227,7 @@ class FastMCPConfig:
             
     async def _handle_error_message(self, message: Message):
         """Handle error messages"""
-        logger.error(f"Error from {message.sender}: {message.content.get('error', 'Unknown error')}")
+        logger.error("Error from %s: %s", message.sender, message.content.get('error', 'Unknown error'))
         
     async def shutdown(self):
         """Shutdown the FastMCP system"""
@@ -6,53 +6,266 @@ Provides advanced AI capabilities for patent analysis, generation, and optimizat
 import os
 import asyncio
 import json
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+from dataclasses import asdict
 import logging
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from google.api_core import exceptions as google_exceptions
 import aiohttp
 import time
+import functools
+import hashlib
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from . import _parsers
+from ._parsers import PatentAnalysis, PatentDraft, SearchResult
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-@dataclass
-class PatentAnalysis:
-    """Patent analysis result"""
-    novelty_score: float
-    inventive_step_score: float
-    industrial_applicability: bool
-    prior_art_analysis: List[Dict[str, Any]]
-    claim_analysis: Dict[str, Any]
-    technical_merit: Dict[str, Any]
-    commercial_potential: str
-    patentability_assessment: str
-    recommendations: List[str]
-
-@dataclass
-class PatentDraft:
-    """Patent draft content"""
-    title: str
-    abstract: str
-    background: str
-    summary: str
-    detailed_description: str
-    claims: List[str]
-    drawings_description: str
-    technical_diagrams: List[str]
-
-@dataclass
-class SearchResult:
-    """Search result for prior art"""
-    patent_id: str
-    title: str
-    abstract: str
-    inventors: List[str]
-    filing_date: str
-    publication_date: str
-    relevance_score: float
-    similarity_analysis: Dict[str, Any]
+# REST endpoint for Gemini Batch Mode (not exposed by the google-generativeai SDK)
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+# Safety settings shared by every client; they never vary per instance
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+}
+
+# Output token budget per task, sized to the reply each prompt asks for
+OUTPUT_TOKEN_BUDGETS = {
+    "analysis": 1536,
+    "prior_art": 2048,
+    "draft": 4096,
+    "review": 1536,
+    "claims": 1536,
+    "diagrams": 1536,
+    "draft_review_claims": 6144,
+}
+
+# Transient failures worth retrying: rate limits, server errors and timeouts
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_GOOGLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+def _json_loads(data: Union[bytes, bytearray]) -> Any:
+    """Deserialize a response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_compact(obj: Any) -> str:
+    """Render an object as compact JSON text for prompt interpolation
+
+    Indentation only costs encoder time and prompt tokens; the model reads
+    compact JSON just as well.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+# Prompt templates, parsed once at import and filled with str.format_map per call.
+# Each asks for JSON so the _parsers module can decode it directly. The fixed
+# instructions and schema come first and the per-call inputs last, so repeated
+# calls share a byte-identical prefix that Gemini can serve from its implicit
+# context cache.
+ANALYSIS_PROMPT_TEMPLATE = """\
+Analyze the patent topic given at the end for patentability.
+
+Please provide a comprehensive analysis including:
+1. Novelty score (0-10)
+2. Inventive step score (0-10)
+3. Industrial applicability assessment
+4. Prior art analysis
+5. Claim analysis
+6. Technical merit assessment
+7. Commercial potential
+8. Overall patentability assessment
+9. Specific recommendations for improvement
+
+Format your response as a structured analysis.
+
+Return only a JSON object matching this schema:
+{{"novelty_score": number, "inventive_step_score": number, "industrial_applicability": boolean,
+ "prior_art_analysis": [object], "claim_analysis": object, "technical_merit": object,
+ "commercial_potential": string, "patentability_assessment": string, "recommendations": [string]}}
+
+Topic: {topic}
+Description: {description}
+"""
+
+PRIOR_ART_PROMPT_TEMPLATE = """\
+Search for prior art related to the patent topic given at the end.
+
+Please identify relevant existing patents and provide:
+1. Patent ID and title
+2. Abstract summary
+3. Inventors and dates
+4. Relevance score (0-10)
+5. Similarity analysis with the proposed invention
+
+Focus on the most relevant and recent patents.
+
+Return only a JSON array whose items match this schema:
+{{"patent_id": string, "title": string, "abstract": string, "inventors": [string],
+ "filing_date": string, "publication_date": string, "relevance_score": number,
+ "similarity_analysis": object}}
+
+Topic: {topic}
+Keywords: {keywords}
+"""
+
+DRAFT_PROMPT_TEMPLATE = """\
+Generate a complete patent draft for the invention given at the end.
+
+Please create:
+1. Patent title
+2. Abstract (150 words max)
+3. Background section
+4. Summary of invention
+5. Detailed description
+6. Claims (at least 3 independent claims)
+7. Drawings description
+8. Technical diagram suggestions
+
+Ensure the draft is legally compliant and technically accurate.
+
+Return only a JSON object matching this schema:
+{{"title": string, "abstract": string, "background": string, "summary": string,
+ "detailed_description": string, "claims": [string], "drawings_description": string,
+ "technical_diagrams": [string]}}
+
+Topic: {topic}
+Description: {description}
+
+Analysis Results:
+- Novelty Score: {novelty_score}/10
+- Inventive Step: {inventive_step_score}/10
+- Patentability: {patentability_assessment}
+"""
+
+REVIEW_PROMPT_TEMPLATE = """\
+Review the patent draft given at the end and provide comprehensive feedback.
+
+Please provide:
+1. Overall quality assessment (1-10)
+2. Technical accuracy review
+3. Legal compliance check
+4. Claim strength analysis
+5. Specific improvement suggestions
+6. Risk assessment
+7. Final recommendation
+
+Be thorough and constructive in your feedback.
+
+Return only a JSON object matching this schema:
+{{"quality_score": number, "technical_accuracy": string, "legal_compliance": string,
+ "claim_strength": string, "improvements": [string], "risks": [string], "recommendation": string}}
+
+Draft Content:
+{draft}
+
+Original Analysis:
+{analysis}
+"""
+
+CLAIMS_PROMPT_TEMPLATE = """\
+Optimize the patent claims given at the end based on the provided feedback.
+
+Please provide:
+1. Optimized claims that address the feedback
+2. Improved claim structure and clarity
+3. Stronger legal protection
+4. Better technical specificity
+
+Maintain the core invention while improving patentability.
+
+Return only a JSON array of the optimized claim texts, as strings.
+
+Current Claims:
+{claims}
+
+Feedback:
+{feedback}
+"""
+
+DIAGRAMS_PROMPT_TEMPLATE = """\
+Generate detailed descriptions for technical diagrams of the invention given at the end.
+
+Please provide:
+1. Figure 1: Overall system architecture
+2. Figure 2: Detailed component diagram
+3. Figure 3: Process flow diagram
+4. Figure 4: Implementation example
+5. Figure 5: Alternative embodiments
+
+Each description should be detailed enough for a technical illustrator to create accurate diagrams.
+
+Return only a JSON array of the figure descriptions, as strings.
+
+Invention Description: {description}
+"""
+
+DRAFT_REVIEW_CLAIMS_PROMPT_TEMPLATE = """\
+Complete the following three steps for the invention given at the end in a single response:
+
+Step 1 - Draft: write a complete, legally compliant patent draft with a title,
+abstract (150 words max), background, summary, detailed description, at least
+3 independent claims, a drawings description and technical diagram suggestions.
+
+Step 2 - Review: critically review your draft for quality (1-10), technical
+accuracy, legal compliance, claim strength, improvements and risks, and give a
+final recommendation.
+
+Step 3 - Optimize: rewrite the draft's claims to address every point raised in
+your review, keeping the core invention.
+
+Return only a JSON object matching this schema:
+{{"draft": {{"title": string, "abstract": string, "background": string, "summary": string,
+            "detailed_description": string, "claims": [string], "drawings_description": string,
+            "technical_diagrams": [string]}},
+ "review": {{"quality_score": number, "technical_accuracy": string, "legal_compliance": string,
+             "claim_strength": string, "improvements": [string], "risks": [string],
+             "recommendation": string}},
+ "optimized_claims": [string]}}
+
+Topic: {topic}
+Description: {description}
+
+Analysis Results:
+- Novelty Score: {novelty_score}/10
+- Inventive Step: {inventive_step_score}/10
+- Patentability: {patentability_assessment}
+"""
+
+def _build_review_prompt(draft: PatentDraft, analysis: PatentAnalysis) -> str:
+    """Render the review prompt, embedding the draft and analysis as JSON"""
+    return REVIEW_PROMPT_TEMPLATE.format_map({
+        "draft": _json_compact(asdict(draft)),
+        "analysis": _json_compact(asdict(analysis))
+    })
 
 class GoogleA2AClient:
     """Google A2A client for patent-related AI operations"""
@@ -62,318 +275,571 @@ class GoogleA2AClient:
         if not self.api_key:
             raise ValueError("Google API key is required")
             
-        # Configure Google AI
-        genai.configure(api_key=self.api_key)
-        
-        # Initialize models
-        self.gemini_pro = genai.GenerativeModel('gemini-pro')
-        self.gemini_pro_vision = genai.GenerativeModel('gemini-pro-vision')
+        # Configure Google AI over gRPC, which multiplexes concurrent requests as
+        # HTTP/2 streams on a shared channel instead of one connection each
+        genai.configure(api_key=self.api_key, transport="grpc")
         
         # Safety settings
-        self.safety_settings = {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-        }
+        self.safety_settings = SAFETY_SETTINGS
+        
+        # Initialize models with the static request settings bound once, so
+        # each generate_content call only has to carry the prompt
+        self.gemini_pro = genai.GenerativeModel('gemini-pro', safety_settings=self.safety_settings)
+        self.gemini_pro_vision = genai.GenerativeModel('gemini-pro-vision', safety_settings=self.safety_settings)
+        
+        # Batch Mode only runs on newer models, so it is configured separately
+        self.batch_model = os.getenv("GEMINI_BATCH_MODEL", "gemini-2.5-flash")
+        
+        # REST request constants, built once rather than per call
+        self._batch_url = f"{GEMINI_API_BASE}/models/{self.batch_model}:batchGenerateContent"
+        self._auth_headers = {"x-goog-api-key": self.api_key}
+        self._json_headers = {**self._auth_headers, "Content-Type": "application/json"}
+        
+        # Shared HTTP session for the REST endpoints, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        
+        # Upper bound on in-flight Gemini requests, created on first use
+        self.max_concurrency = int(os.getenv("GEMINI_CONCURRENCY", "8"))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Retry policy for transient failures (exponential backoff with jitter)
+        self.max_retries = int(os.getenv("GEMINI_MAX_RETRIES", "5"))
+        self.retry_base_delay = 1.0
+        self.retry_max_delay = 30.0
+        
+        # LRU cache of responses keyed by prompt hash, so repeated prompts
+        # during iterative refinement skip the network
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.response_cache_size = 256
+        
+        # Optional on-disk cache behind the LRU, so identical prompts are
+        # answered without a Gemini call across runs as well as within one
+        self._disk_cache: Optional[sqlite3.Connection] = None
+        self._disk_cache_lock = threading.Lock()
+        cache_path = os.getenv("GEMINI_CACHE_PATH")
+        if cache_path:
+            # Accept ~/.cache/... style locations and create missing directories
+            cache_path = os.path.expanduser(cache_path)
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            self._disk_cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._disk_cache.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+            )
+            self._disk_cache.commit()
+            
+        # Requests currently on the wire, so identical concurrent prompts share one call
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
         
         logger.info("Google A2A client initialized successfully")
         
     async def analyze_patent_topic(self, topic: str, description: str) -> PatentAnalysis:
         """Analyze a patent topic for novelty and patentability"""
         try:
-            prompt = f"""
-            Analyze the following patent topic for patentability:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Please provide a comprehensive analysis including:
-            1. Novelty score (0-10)
-            2. Inventive step score (0-10)
-            3. Industrial applicability assessment
-            4. Prior art analysis
-            5. Claim analysis
-            6. Technical merit assessment
-            7. Commercial potential
-            8. Overall patentability assessment
-            9. Specific recommendations for improvement
-            
-            Format your response as a structured analysis.
-            """
-            
-            response = await self._generate_response(prompt)
+            prompt = self._build_analysis_prompt(topic, description)
+            
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["analysis"])
             return self._parse_patent_analysis(response)
             
         except Exception as e:
-            logger.error(f"Error analyzing patent topic: {e}")
+            logger.error("Error analyzing patent topic: %s", e)
             raise
             
+    def _build_analysis_prompt(self, topic: str, description: str) -> str:
+        """Build the patentability analysis prompt for a topic"""
+        return ANALYSIS_PROMPT_TEMPLATE.format_map({"topic": topic, "description": description})
+            
     async def search_prior_art(self, topic: str, keywords: List[str], 
                               max_results: int = 20) -> List[SearchResult]:
         """Search for prior art related to the patent topic"""
         try:
-            prompt = f"""
-            Search for prior art related to the following patent topic:
-            
-            Topic: {topic}
-            Keywords: {', '.join(keywords)}
-            
-            Please identify relevant existing patents and provide:
-            1. Patent ID and title
-            2. Abstract summary
-            3. Inventors and dates
-            4. Relevance score (0-10)
-            5. Similarity analysis with the proposed invention
+            prompt = PRIOR_ART_PROMPT_TEMPLATE.format_map({"topic": topic, "keywords": ", ".join(keywords)})
             
-            Focus on the most relevant and recent patents.
-            """
-            
-            response = await self._generate_response(prompt)
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["prior_art"])
             return self._parse_search_results(response)
             
         except Exception as e:
-            logger.error(f"Error searching prior art: {e}")
+            logger.error("Error searching prior art: %s", e)
             raise
             
     async def generate_patent_draft(self, topic: str, description: str, 
                                   analysis: PatentAnalysis) -> PatentDraft:
         """Generate a complete patent draft"""
         try:
-            prompt = f"""
-            Generate a complete patent draft for the following invention:
-            
-            Topic: {topic}
-            Description: {description}
-            
-            Analysis Results:
-            - Novelty Score: {analysis.novelty_score}/10
-            - Inventive Step: {analysis.inventive_step_score}/10
-            - Patentability: {analysis.patentability_assessment}
-            
-            Please create:
-            1. Patent title
-            2. Abstract (150 words max)
-            3. Background section
-            4. Summary of invention
-            5. Detailed description
-            6. Claims (at least 3 independent claims)
-            7. Drawings description
-            8. Technical diagram suggestions
-            
-            Ensure the draft is legally compliant and technically accurate.
-            """
-            
-            response = await self._generate_response(prompt)
+            prompt = DRAFT_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description,
+                "novelty_score": analysis.novelty_score,
+                "inventive_step_score": analysis.inventive_step_score,
+                "patentability_assessment": analysis.patentability_assessment
+            })
+            
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["draft"])
             return self._parse_patent_draft(response)
             
         except Exception as e:
-            logger.error(f"Error generating patent draft: {e}")
+            logger.error("Error generating patent draft: %s", e)
             raise
             
     async def review_patent_draft(self, draft: PatentDraft, 
                                 analysis: PatentAnalysis) -> Dict[str, Any]:
         """Review and provide feedback on a patent draft"""
         try:
-            prompt = f"""
-            Review the following patent draft and provide comprehensive feedback:
-            
-            Draft Content:
-            {json.dumps(asdict(draft), indent=2)}
-            
-            Original Analysis:
-            {json.dumps(asdict(analysis), indent=2)}
-            
-            Please provide:
-            1. Overall quality assessment (1-10)
-            2. Technical accuracy review
-            3. Legal compliance check
-            4. Claim strength analysis
-            5. Specific improvement suggestions
-            6. Risk assessment
-            7. Final recommendation
+            # Serializing a long draft can take milliseconds, so keep it off the event loop
+            loop = asyncio.get_running_loop()
+            prompt = await loop.run_in_executor(None, _build_review_prompt, draft, analysis)
             
-            Be thorough and constructive in your feedback.
-            """
-            
-            response = await self._generate_response(prompt)
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["review"])
             return self._parse_review_feedback(response)
             
         except Exception as e:
-            logger.error(f"Error reviewing patent draft: {e}")
+            logger.error("Error reviewing patent draft: %s", e)
             raise
             
     async def optimize_patent_claims(self, claims: List[str], 
                                    feedback: Dict[str, Any]) -> List[str]:
         """Optimize patent claims based on feedback"""
         try:
-            prompt = f"""
-            Optimize the following patent claims based on the provided feedback:
+            prompt = CLAIMS_PROMPT_TEMPLATE.format_map({
+                "claims": _json_compact(claims),
+                "feedback": _json_compact(feedback)
+            })
             
-            Current Claims:
-            {json.dumps(claims, indent=2)}
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["claims"])
+            return self._parse_optimized_claims(response)
             
-            Feedback:
-            {json.dumps(feedback, indent=2)}
+        except Exception as e:
+            logger.error("Error optimizing patent claims: %s", e)
+            raise
             
-            Please provide:
-            1. Optimized claims that address the feedback
-            2. Improved claim structure and clarity
-            3. Stronger legal protection
-            4. Better technical specificity
+    async def generate_technical_diagrams(self, description: str) -> List[str]:
+        """Generate descriptions for technical diagrams"""
+        try:
+            prompt = DIAGRAMS_PROMPT_TEMPLATE.format_map({"description": description})
             
-            Maintain the core invention while improving patentability.
-            """
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["diagrams"])
+            return self._parse_diagram_descriptions(response)
             
-            response = await self._generate_response(prompt)
-            return self._parse_optimized_claims(response)
+        except Exception as e:
+            logger.error("Error generating technical diagrams: %s", e)
+            raise
+            
+    async def draft_review_optimize(self, topic: str, description: str,
+                                    analysis: PatentAnalysis) -> Tuple[PatentDraft, Dict[str, Any], List[str]]:
+        """Draft, review and optimize claims for a patent in a single round trip"""
+        try:
+            prompt = DRAFT_REVIEW_CLAIMS_PROMPT_TEMPLATE.format_map({
+                "topic": topic,
+                "description": description,
+                "novelty_score": analysis.novelty_score,
+                "inventive_step_score": analysis.inventive_step_score,
+                "patentability_assessment": analysis.patentability_assessment
+            })
+            
+            response = await self._generate_response(prompt, stop_at_json=True,
+                                                     max_output_tokens=OUTPUT_TOKEN_BUDGETS["draft_review_claims"])
+            return _parsers.parse_draft_review_claims(response)
             
         except Exception as e:
-            logger.error(f"Error optimizing patent claims: {e}")
+            logger.error("Error in combined draft/review/optimize: %s", e)
             raise
             
-    async def generate_technical_diagrams(self, description: str) -> List[str]:
-        """Generate descriptions for technical diagrams"""
+    async def analyze_patent_topics(self, items: List[Tuple[str, str]]) -> List[PatentAnalysis]:
+        """Analyze several (topic, description) pairs concurrently"""
         try:
-            prompt = f"""
-            Generate detailed descriptions for technical diagrams based on:
+            prompts = [self._build_analysis_prompt(topic, description) for topic, description in items]
             
-            Invention Description: {description}
+            responses = await self.generate_responses(prompts, stop_at_json=True,
+                                                      max_output_tokens=OUTPUT_TOKEN_BUDGETS["analysis"])
+            return [self._parse_patent_analysis(response) for response in responses]
             
-            Please provide:
-            1. Figure 1: Overall system architecture
-            2. Figure 2: Detailed component diagram
-            3. Figure 3: Process flow diagram
-            4. Figure 4: Implementation example
-            5. Figure 5: Alternative embodiments
+        except Exception as e:
+            logger.error("Error analyzing patent topics: %s", e)
+            raise
             
-            Each description should be detailed enough for a technical illustrator to create accurate diagrams.
-            """
+    async def generate_responses(self, prompts: List[str], stop_at_json: bool = False,
+                                 max_output_tokens: Optional[int] = None) -> List[str]:
+        """Generate responses for several prompts concurrently, preserving order"""
+        return await asyncio.gather(*(
+            self._generate_response(prompt, stop_at_json, max_output_tokens) for prompt in prompts
+        ))
+        
+    async def analyze_patent_topics_batch_api(self, items: List[Tuple[str, str]]) -> List[PatentAnalysis]:
+        """Analyze many (topic, description) pairs through Gemini Batch Mode"""
+        try:
+            prompts = [self._build_analysis_prompt(topic, description) for topic, description in items]
             
-            response = await self._generate_response(prompt)
-            return self._parse_diagram_descriptions(response)
+            batch_id = await self.submit_batch(prompts)
+            responses = await self.await_batch(batch_id, len(prompts))
+            return [self._parse_patent_analysis(response) for response in responses]
             
         except Exception as e:
-            logger.error(f"Error generating technical diagrams: {e}")
+            logger.error("Error analyzing patent topics in batch: %s", e)
             raise
             
-    async def _generate_response(self, prompt: str) -> str:
-        """Generate response using Google Gemini Pro"""
+    async def submit_batch(self, prompts: List[str]) -> str:
+        """Submit prompts as one Gemini batch job and return its batch id"""
         try:
-            response = self.gemini_pro.generate_content(
-                prompt,
-                safety_settings=self.safety_settings
+            data = {
+                "batch": {
+                    "display_name": f"patent_batch_{int(time.time())}",
+                    "input_config": {
+                        "requests": {
+                            "requests": [
+                                {
+                                    "request": {"contents": [{"parts": [{"text": prompt}]}]},
+                                    "metadata": {"key": str(i)}
+                                }
+                                for i, prompt in enumerate(prompts)
+                            ]
+                        }
+                    }
+                }
+            }
+            
+            # Sent once: a retry after the server accepted the job (e.g. on a
+            # timeout or 5xx) would create a duplicate, separately billed batch
+            result = await self._request_json(
+                "POST", self._batch_url, self._json_headers, _json_dumps(data), retry=False
             )
-            return response.text
+            
+            batch_id = result["name"]
+            logger.info("Submitted batch %s with %s prompts", batch_id, len(prompts))
+            return batch_id
             
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
+            logger.error("Error submitting batch: %s", e)
             raise
             
-    def _parse_patent_analysis(self, response: str) -> PatentAnalysis:
-        """Parse patent analysis from AI response"""
+    async def await_batch(self, batch_id: str, count: int, poll_interval: float = 30.0,
+                          timeout: float = 24 * 3600) -> List[str]:
+        """Poll a batch job until it finishes and return its count responses in submission order
+
+        A prompt whose response is missing or failed yields an empty string.
+        """
         try:
-            # This is a simplified parser - in production, you'd want more robust parsing
-            # For now, we'll create a structured response
-            return PatentAnalysis(
-                novelty_score=8.5,
-                inventive_step_score=7.8,
-                industrial_applicability=True,
-                prior_art_analysis=[],
-                claim_analysis={},
-                technical_merit={},
-                commercial_potential="Medium to High",
-                patentability_assessment="Strong",
-                recommendations=["Improve claim specificity", "Add more technical details"]
-            )
+            url = f"{GEMINI_API_BASE}/{batch_id}"
+            start_time = time.monotonic()
+            
+            while True:
+                result = await self._request_json("GET", url, self._auth_headers)
+                
+                if result.get("done"):
+                    break
+                if time.monotonic() - start_time > timeout:
+                    raise TimeoutError(f"Batch {batch_id} did not complete within {timeout} seconds")
+                    
+                await asyncio.sleep(poll_interval)
+                    
+            if "error" in result:
+                raise RuntimeError(f"Batch {batch_id} failed: {result['error']}")
+                
+            inlined = result.get("response", {}).get("inlinedResponses", [])
+            if isinstance(inlined, dict):
+                inlined = inlined.get("inlinedResponses", [])
+                
+            # Failed items keep their key but carry an error instead of a response
+            responses = {}
+            for item in inlined:
+                key = (item.get("metadata") or {}).get("key")
+                candidates = (item.get("response") or {}).get("candidates") or [{}]
+                parts = candidates[0].get("content", {}).get("parts", [])
+                responses[key] = "".join(part.get("text", "") for part in parts)
+                
+            # Look responses up by the keys submit_batch assigned, so an item
+            # with a missing or unexpected key cannot break the ordering
+            missing = [key for key in map(str, range(count)) if key not in responses]
+            if missing:
+                logger.warning("Batch %s returned no response for %s of %s prompts",
+                               batch_id, len(missing), count)
+            return [responses.get(str(i), "") for i in range(count)]
+            
         except Exception as e:
-            logger.error(f"Error parsing patent analysis: {e}")
+            logger.error("Error awaiting batch %s: %s", batch_id, e)
             raise
             
-    def _parse_search_results(self, response: str) -> List[SearchResult]:
-        """Parse search results from AI response"""
+    async def _request_json(self, method: str, url: str, headers: Dict[str, str],
+                            data: Optional[bytes] = None, retry: bool = True) -> Dict[str, Any]:
+        """Send a REST request and decode the JSON response
+
+        Transient failures are retried unless retry is False, for requests
+        that are not safe to repeat.
+        """
+        async def send() -> Dict[str, Any]:
+            session = await self._get_session()
+            async with session.request(method, url, headers=headers, data=data) as response:
+                response.raise_for_status()
+                # Batch results can be large; accumulate into one growable buffer
+                # and decode it in place rather than joining a copy first
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                return _json_loads(body)
+                
+        if not retry:
+            return await send()
+        return await self._call_with_retry(send, f"{method} {url}")
+        
+    async def _call_with_retry(self, call: Callable[[], Awaitable[Any]], description: str) -> Any:
+        """Await call(), retrying transient failures with exponential backoff and jitter"""
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                logger.warning("Transient error on %s (attempt %s/%s), retrying in %.1fs: %s",
+                               description, attempt, self.max_retries, delay, e)
+                await asyncio.sleep(delay)
+                
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying error, or None if it is not transient"""
+        if isinstance(error, aiohttp.ClientResponseError):
+            if error.status not in RETRYABLE_STATUS_CODES:
+                return None
+            # Honor the server's Retry-After hint when it gives one in seconds
+            retry_after = (error.headers or {}).get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.retry_max_delay)
+                except ValueError:
+                    pass
+        elif not isinstance(error, (RETRYABLE_GOOGLE_ERRORS, aiohttp.ClientConnectionError,
+                                    asyncio.TimeoutError)):
+            return None
+            
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            # The lock is created lazily so it binds to the running event loop
+            if self._session_lock is None:
+                self._session_lock = asyncio.Lock()
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    connector = aiohttp.TCPConnector(
+                        limit=100,
+                        limit_per_host=32,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=60
+                    )
+                    self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+        
+    async def close(self):
+        """Close the shared HTTP session and the on-disk response cache
+
+        Fetches still in flight are awaited first so none of them finds the
+        disk cache closed under it.
+        """
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+            
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+        if self._disk_cache is not None:
+            with self._disk_cache_lock:
+                self._disk_cache.close()
+                self._disk_cache = None
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        
+    async def stream_response(self, prompt: str, max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream response text from Google Gemini Pro as chunks arrive"""
         try:
-            # Simplified parser - in production, integrate with actual patent databases
-            return [
-                SearchResult(
-                    patent_id="US12345678",
-                    title="Example Prior Art Patent",
-                    abstract="This is an example prior art patent...",
-                    inventors=["John Doe", "Jane Smith"],
-                    filing_date="2020-01-01",
-                    publication_date="2021-01-01",
-                    relevance_score=7.5,
-                    similarity_analysis={"overlap": "30%", "differences": "Key differences noted"}
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self._semaphore:
+                generation_config = {"max_output_tokens": max_output_tokens} if max_output_tokens else None
+                response = await self.gemini_pro.generate_content_async(
+                    prompt, stream=True, generation_config=generation_config
                 )
-            ]
+                async for chunk in response:
+                    yield chunk.text
+                    
         except Exception as e:
-            logger.error(f"Error parsing search results: {e}")
+            logger.error("Error streaming response: %s", e)
             raise
             
-    def _parse_patent_draft(self, response: str) -> PatentDraft:
-        """Parse patent draft from AI response"""
+    async def warmup(self):
+        """Open the gRPC channel and HTTP session ahead of the first real request"""
         try:
-            # Simplified parser
-            return PatentDraft(
-                title="Generated Patent Title",
-                abstract="This is a generated abstract...",
-                background="Background section...",
-                summary="Summary of invention...",
-                detailed_description="Detailed description...",
-                claims=["Claim 1...", "Claim 2...", "Claim 3..."],
-                drawings_description="Drawings description...",
-                technical_diagrams=["Figure 1 description", "Figure 2 description"]
-            )
+            # count_tokens is a cheap round trip that establishes the channel and TLS
+            await self.gemini_pro.count_tokens_async("warmup")
+            await self._get_session()
+            logger.info("Google A2A client warmed up")
+            
         except Exception as e:
-            logger.error(f"Error parsing patent draft: {e}")
-            raise
+            logger.warning("Google A2A client warmup failed: %s", e)
             
-    def _parse_review_feedback(self, response: str) -> Dict[str, Any]:
-        """Parse review feedback from AI response"""
+    async def _generate_response(self, prompt: str, stop_at_json: bool = False,
+                                 max_output_tokens: Optional[int] = None) -> str:
+        """Generate response using Google Gemini Pro
+
+        With stop_at_json, streaming stops as soon as the reply's leading JSON
+        value is complete, so trailing commentary is neither waited for nor billed.
+        max_output_tokens caps the reply length (model default when None).
+        """
         try:
-            return {
-                "quality_score": 8.0,
-                "technical_accuracy": "Good",
-                "legal_compliance": "Compliant",
-                "claim_strength": "Strong",
-                "improvements": ["Add more examples", "Clarify technical terms"],
-                "risks": ["Potential prior art conflicts"],
-                "recommendation": "Proceed with minor revisions"
-            }
+            # The model name and output cap are part of the key so persisted
+            # entries survive a model switch and budget changes; stop_at_json is
+            # too, since an early-stopped reply is not the full one
+            key = hashlib.sha256(
+                f"{self.gemini_pro.model_name}|{max_output_tokens}|{stop_at_json}|{prompt}".encode("utf-8")
+            ).hexdigest()
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+                return cached
+                
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                # The fetch runs as its own task, so cancelling any one caller,
+                # including the one that started it, only drops that caller's wait
+                inflight = asyncio.ensure_future(
+                    self._fetch_response(key, prompt, stop_at_json, max_output_tokens)
+                )
+                self._inflight[key] = inflight
+                inflight.add_done_callback(functools.partial(self._forget_inflight, key))
+            return await asyncio.shield(inflight)
+            
         except Exception as e:
-            logger.error(f"Error parsing review feedback: {e}")
+            logger.error("Error generating response: %s", e)
             raise
             
+    async def _fetch_response(self, key: str, prompt: str, stop_at_json: bool,
+                              max_output_tokens: Optional[int]) -> str:
+        """Fetch a reply from the disk cache or the model and add it to the LRU cache"""
+        loop = asyncio.get_running_loop()
+        text = None
+        if self._disk_cache is not None:
+            text = await loop.run_in_executor(None, self._disk_cache_get, key)
+            
+        if text is None:
+            async def collect() -> str:
+                chunks = []
+                stream = self.stream_response(prompt, max_output_tokens)
+                try:
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        if stop_at_json and ("}" in chunk or "]" in chunk):
+                            text = "".join(chunks)
+                            if _parsers.leading_json_end(text) >= 0:
+                                return text
+                finally:
+                    # Close explicitly so an early return releases the semaphore now
+                    await stream.aclose()
+                return "".join(chunks)
+                
+            text = await self._call_with_retry(collect, "generate_content")
+            # Only cache replies worth replaying; an empty or truncated one
+            # would otherwise come back on every later call and run
+            if not text.strip() or (stop_at_json and _parsers.extract_json(text) is None):
+                return text
+            if self._disk_cache is not None:
+                await loop.run_in_executor(None, self._disk_cache_put, key, text)
+                
+        self._response_cache[key] = text
+        if len(self._response_cache) > self.response_cache_size:
+            self._response_cache.popitem(last=False)
+        return text
+        
+    def _forget_inflight(self, key: str, task: "asyncio.Future[str]"):
+        """Drop a finished fetch so later misses start a new one"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark any exception retrieved in case every caller stopped waiting
+        if not task.cancelled():
+            task.exception()
+            
+    def _disk_cache_get(self, key: str) -> Optional[str]:
+        """Look up a persisted response (runs in an executor thread)"""
+        with self._disk_cache_lock:
+            if self._disk_cache is None:
+                return None
+            row = self._disk_cache.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+        
+    def _disk_cache_put(self, key: str, response: str):
+        """Persist a response (runs in an executor thread)"""
+        with self._disk_cache_lock:
+            if self._disk_cache is None:
+                return
+            self._disk_cache.execute("INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                                     (key, response))
+            self._disk_cache.commit()
+            
+    def _parse_patent_analysis(self, response: str) -> PatentAnalysis:
+        """Parse patent analysis from AI response"""
+        return _parsers.parse_patent_analysis(response)
+            
+    def _parse_search_results(self, response: str) -> List[SearchResult]:
+        """Parse search results from AI response"""
+        return _parsers.parse_search_results(response)
+            
+    def _parse_patent_draft(self, response: str) -> PatentDraft:
+        """Parse patent draft from AI response"""
+        return _parsers.parse_patent_draft(response)
+            
+    def _parse_review_feedback(self, response: str) -> Dict[str, Any]:
+        """Parse review feedback from AI response"""
+        return _parsers.parse_review_feedback(response)
+            
     def _parse_optimized_claims(self, response: str) -> List[str]:
         """Parse optimized claims from AI response"""
-        try:
-            return [
-                "Optimized Claim 1...",
-                "Optimized Claim 2...",
-                "Optimized Claim 3..."
-            ]
-        except Exception as e:
-            logger.error(f"Error parsing optimized claims: {e}")
-            raise
+        return _parsers.parse_optimized_claims(response)
             
     def _parse_diagram_descriptions(self, response: str) -> List[str]:
         """Parse diagram descriptions from AI response"""
-        try:
-            return [
-                "Figure 1: System Architecture - Shows the overall structure...",
-                "Figure 2: Component Diagram - Illustrates individual components...",
-                "Figure 3: Process Flow - Demonstrates the workflow..."
-            ]
-        except Exception as e:
-            logger.error(f"Error parsing diagram descriptions: {e}")
-            raise
+        return _parsers.parse_diagram_descriptions(response)
 
 # Global Google A2A client instance
 google_a2a_client = None
+_google_a2a_client_lock: Optional[asyncio.Lock] = None
 
 async def get_google_a2a_client() -> GoogleA2AClient:
-    """Get or create the global Google A2A client"""
-    global google_a2a_client
+    """Get or create the global Google A2A client (kept until close_google_a2a_client)
+
+    The entry points install uvloop when available, which lowers per-request
+    overhead for the client's aiohttp traffic.
+    """
+    global google_a2a_client, _google_a2a_client_lock
     if google_a2a_client is None:
-        google_a2a_client = GoogleA2AClient()
-    return google_a2a_client
\ No newline at end of file
+        # Double-checked so concurrent first callers share one instance; the
+        # lock is created lazily so it binds to the running event loop
+        if _google_a2a_client_lock is None:
+            _google_a2a_client_lock = asyncio.Lock()
+        async with _google_a2a_client_lock:
+            if google_a2a_client is None:
+                google_a2a_client = GoogleA2AClient()
+    return google_a2a_client
+
+async def close_google_a2a_client():
+    """Close the global Google A2A client, if one was created
+
+    The client is dropped so the next get_google_a2a_client() builds a fresh
+    one with its own session and disk cache.
+    """
+    global google_a2a_client
+    client, google_a2a_client = google_a2a_client, None
+    if client is not None:
+        await client.close()
\ No newline at end of file
@@ -6,18 +6,23 @@ Multi-agent system for patent planning, research, discussion, writing, and revie
 
 import asyncio
 import argparse
+import contextlib
+import json
 import logging
 import sys
-import os
-from typing import Dict, Any
-from rich.console import Console
+from typing import Dict, Any, List
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt, Confirm
-from rich.text import Text
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from patent_agent_system import PatentAgentSystem
+from google_a2a_client import get_google_a2a_client, close_google_a2a_client
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +33,45 @@ logger = logging.getLogger(__name__)
 
 console = Console()
 
+# Agents listed by the status screens, in workflow order
+AGENT_NAMES = ("planner_agent", "searcher_agent", "discusser_agent",
+               "writer_agent", "reviewer_agent", "rewriter_agent", "coordinator_agent")
+
+# Static help screen, built once and reprinted on each 'help' command
+HELP_PANEL = Panel("""
+[bold cyan]Available Commands:[/bold cyan]
+
+[bold]help[/bold]     - Show this help message
+[bold]status[/bold]   - Show system status
+[bold]workflow[/bold] - Run patent development workflow
+[bold]health[/bold]   - Perform health check
+[bold]agents[/bold]   - Show agent details
+[bold]workflows[/bold] - Show active workflows
+[bold]ask[/bold]      - Ask Gemini a question and stream the answer
+[bold]quit[/bold]     - Exit the system
+
+[bold cyan]Patent Development Workflow:[/bold cyan]
+1. Planning & Strategy (Planner Agent)
+2. Prior Art Search (Searcher Agent)
+3. Innovation Discussion (Discusser Agent)
+4. Patent Drafting (Writer Agent)
+5. Quality Review (Reviewer Agent)
+6. Final Rewrite (Rewriter Agent)
+
+[bold cyan]System Features:[/bold cyan]
+- FastMCP message passing and coordination
+- Google A2A AI-powered content generation
+- Multi-agent collaboration and workflow management
+- Automated quality assessment and improvement
+- Comprehensive patent compliance checking
+        """, title="Help", border_style="blue")
+
+def status_spinner(message: str):
+    """Show a spinner while awaiting on a terminal; render nothing when output is piped"""
+    if console.is_terminal:
+        return console.status(message, spinner="dots")
+    return contextlib.nullcontext()
+
 class PatentAgentDemo:
     """Main demo class for the Patent Agent System"""
     
@@ -46,18 +90,10 @@ class PatentAgentDemo:
             ))
             
             # Initialize the system
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Initializing Patent Agent System...", total=None)
-                
+            with status_spinner("Initializing Patent Agent System..."):
                 self.patent_system = PatentAgentSystem()
                 await self.patent_system.start()
                 
-                progress.update(task, description="System initialized successfully!")
-                
             self.is_running = True
             console.print("[green]✓ Patent Agent System started successfully![/green]")
             
@@ -66,30 +102,22 @@ class PatentAgentDemo:
             
         except Exception as e:
             console.print(f"[red]✗ Failed to start Patent Agent System: {e}[/red]")
-            logger.error(f"Startup error: {e}")
+            logger.error("Startup error: %s", e)
             raise
             
     async def stop(self):
         """Stop the patent agent demo"""
         try:
             if self.patent_system and self.is_running:
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    console=console
-                ) as progress:
-                    task = progress.add_task("Shutting down Patent Agent System...", total=None)
-                    
+                with status_spinner("Shutting down Patent Agent System..."):
                     await self.patent_system.stop()
                     
-                    progress.update(task, description="System shutdown complete!")
-                    
                 self.is_running = False
                 console.print("[green]✓ Patent Agent System stopped successfully![/green]")
                 
         except Exception as e:
             console.print(f"[red]✗ Error during shutdown: {e}[/red]")
-            logger.error(f"Shutdown error: {e}")
+            logger.error("Shutdown error: %s", e)
             
     async def show_system_status(self):
         """Display system status"""
@@ -124,17 +152,17 @@ class PatentAgentDemo:
             if not self.patent_system:
                 return
                 
-            console.print("\n[bold cyan]Agent Details:[/bold cyan]")
+            lines = ["\n[bold cyan]Agent Details:[/bold cyan]"]
             
-            agents = ["planner_agent", "searcher_agent", "discusser_agent", 
-                     "writer_agent", "reviewer_agent", "rewriter_agent", "coordinator_agent"]
-            
-            for agent_name in agents:
+            for agent_name in AGENT_NAMES:
                 agent_status = await self.patent_system.get_agent_status(agent_name)
                 if agent_status:
                     status_icon = "🟢" if agent_status.get("status") == "idle" else "🟡"
-                    console.print(f"{status_icon} {agent_name}: {agent_status.get('status', 'unknown')}")
+                    lines.append(f"{status_icon} {agent_name}: {agent_status.get('status', 'unknown')}")
                     
+            # Render the whole block in one print rather than one per agent
+            console.print("\n".join(lines))
+            
         except Exception as e:
             console.print(f"[red]Error getting agent details: {e}[/red]")
             
@@ -158,32 +186,96 @@ class PatentAgentDemo:
                 return
                 
             # Start the workflow
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Starting patent development workflow...", total=None)
-                
-                try:
+            try:
+                with status_spinner("Running patent development workflow..."):
                     result = await self.patent_system.develop_patent(topic, description)
                     
-                    progress.update(task, description="Workflow completed successfully!")
-                    
-                    # Display results
-                    await self.display_workflow_results(result)
-                    
-                except Exception as e:
-                    progress.update(task, description="Workflow failed!")
-                    console.print(f"[red]Workflow error: {e}[/red]")
+                # Display results
+                await self.display_workflow_results(result)
+                
+            except Exception as e:
+                console.print(f"[red]Workflow error: {e}[/red]")
                     
         except Exception as e:
             console.print(f"[red]Error running demo workflow: {e}[/red]")
             
+    async def run_batch_workflows(self, path: str):
+        """Develop every patent listed in a JSON file and summarize the outcomes"""
+        try:
+            if not self.patent_system or not self.is_running:
+                console.print("[red]System not running. Please start the system first.[/red]")
+                return
+                
+            with open(path, encoding="utf-8") as f:
+                items: List[Dict[str, str]] = json.load(f)
+                
+            with status_spinner(f"Developing {len(items)} patents..."):
+                results = await self.patent_system.develop_patents(items)
+                
+            table = Table(title="Batch Results")
+            table.add_column("Topic", style="cyan")
+            table.add_column("Status", style="green")
+            table.add_column("Workflow ID", style="blue")
+            
+            for item, result in zip(items, results):
+                table.add_row(
+                    str(item.get("topic", "N/A")),
+                    str(result.get("status", "N/A")),
+                    str(result.get("workflow_id", "N/A"))
+                )
+                
+            console.print(table)
+            
+        except Exception as e:
+            console.print(f"[red]Error running batch workflows: {e}[/red]")
+            
+    async def run_batch_analysis(self, path: str, use_batch_api: bool = False):
+        """Score every topic listed in a JSON file without running full workflows
+
+        Online, the analyses run concurrently under the client's concurrency cap;
+        with use_batch_api they go through Gemini Batch Mode, which is cheaper but
+        can take much longer to complete.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                items: List[Dict[str, str]] = json.load(f)
+                
+            pairs = [(item.get("topic", ""), item.get("description", "")) for item in items]
+            client = await get_google_a2a_client()
+            
+            with status_spinner(f"Analyzing {len(pairs)} topics..."):
+                if use_batch_api:
+                    analyses = await client.analyze_patent_topics_batch_api(pairs)
+                else:
+                    analyses = await client.analyze_patent_topics(pairs)
+                    
+            table = Table(title="Batch Analysis")
+            table.add_column("Topic", style="cyan")
+            table.add_column("Novelty", style="green")
+            table.add_column("Inventive Step", style="green")
+            table.add_column("Assessment", style="yellow")
+            
+            for (topic, _), analysis in zip(pairs, analyses):
+                table.add_row(
+                    topic or "N/A",
+                    f"{analysis.novelty_score:.1f}",
+                    f"{analysis.inventive_step_score:.1f}",
+                    analysis.patentability_assessment
+                )
+                
+            console.print(table)
+            
+        except Exception as e:
+            console.print(f"[red]Error running batch analysis: {e}[/red]")
+        finally:
+            # The agent system never started, so its shutdown will not close the client
+            await close_google_a2a_client()
+            
     async def display_workflow_results(self, result: Dict[str, Any]):
         """Display workflow results"""
         try:
-            console.print("\n[bold green]🎯 Patent Development Complete![/bold green]")
+            # Collect everything and render it with a single print
+            renderables = ["\n[bold green]🎯 Patent Development Complete![/bold green]"]
             
             # Create results table
             table = Table(title="Workflow Results")
@@ -199,12 +291,12 @@ class PatentAgentDemo:
             if "message" in result:
                 table.add_row("Message", result["message"])
                 
-            console.print(table)
+            renderables.append(table)
             
             # Show patent summary if available
             if "patent_summary" in result:
                 summary = result["patent_summary"]
-                console.print("\n[bold cyan]Patent Summary:[/bold cyan]")
+                renderables.append("\n[bold cyan]Patent Summary:[/bold cyan]")
                 
                 summary_table = Table()
                 summary_table.add_column("Field", style="cyan")
@@ -217,16 +309,18 @@ class PatentAgentDemo:
                 if "confidence_score" in summary:
                     summary_table.add_row("Confidence Score", f"{summary['confidence_score']:.1%}")
                     
-                console.print(summary_table)
+                renderables.append(summary_table)
                 
+            console.print(Group(*renderables))
+            
         except Exception as e:
             console.print(f"[red]Error displaying results: {e}[/red]")
             
     async def interactive_mode(self):
         """Run interactive mode"""
         try:
-            console.print("\n[bold blue]Interactive Mode[/bold blue]")
-            console.print("Type 'help' for available commands, 'quit' to exit.")
+            console.print("\n[bold blue]Interactive Mode[/bold blue]\n"
+                          "Type 'help' for available commands, 'quit' to exit.")
             
             while self.is_running:
                 try:
@@ -246,9 +340,11 @@ class PatentAgentDemo:
                         await self.show_agent_details()
                     elif command.lower() == 'workflows':
                         await self.show_active_workflows()
+                    elif command.lower() == 'ask':
+                        await self.ask_model()
                     else:
-                        console.print(f"[yellow]Unknown command: {command}[/yellow]")
-                        console.print("Type 'help' for available commands.")
+                        console.print(f"[yellow]Unknown command: {command}[/yellow]\n"
+                                      "Type 'help' for available commands.")
                         
                 except KeyboardInterrupt:
                     console.print("\n[yellow]Use 'quit' to exit.[/yellow]")
@@ -260,55 +356,33 @@ class PatentAgentDemo:
             
     async def show_help(self):
         """Show help information"""
-        help_text = """
-[bold cyan]Available Commands:[/bold cyan]
-
-[bold]help[/bold]     - Show this help message
-[bold]status[/bold]   - Show system status
-[bold]workflow[/bold] - Run patent development workflow
-[bold]health[/bold]   - Perform health check
-[bold]agents[/bold]   - Show agent details
-[bold]workflows[/bold] - Show active workflows
-[bold]quit[/bold]     - Exit the system
-
-[bold cyan]Patent Development Workflow:[/bold cyan]
-1. Planning & Strategy (Planner Agent)
-2. Prior Art Search (Searcher Agent)
-3. Innovation Discussion (Discusser Agent)
-4. Patent Drafting (Writer Agent)
-5. Quality Review (Reviewer Agent)
-6. Final Rewrite (Rewriter Agent)
-
-[bold cyan]System Features:[/bold cyan]
-- FastMCP message passing and coordination
-- Google A2A AI-powered content generation
-- Multi-agent collaboration and workflow management
-- Automated quality assessment and improvement
-- Comprehensive patent compliance checking
-        """
-        
-        console.print(Panel(help_text, title="Help", border_style="blue"))
+        console.print(HELP_PANEL)
         
+    async def ask_model(self):
+        """Stream a free-form Gemini answer to the console as it is generated"""
+        try:
+            prompt = Prompt.ask("Enter your question")
+            client = await get_google_a2a_client()
+            
+            # Print each chunk on arrival so the first words appear after the
+            # first-token latency rather than the full generation time
+            async for chunk in client.stream_response(prompt):
+                console.print(chunk, end="", markup=False, highlight=False)
+            console.print()
+            
+        except Exception as e:
+            console.print(f"[red]Error streaming answer: {e}[/red]")
+            
     async def show_health_check(self):
         """Perform and display health check"""
         try:
             if not self.patent_system:
                 return
                 
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Performing health check...", total=None)
-                
+            with status_spinner("Performing health check..."):
                 health_status = await self.patent_system.health_check()
                 
-                progress.update(task, description="Health check completed!")
-                
             # Display health status
-            console.print("\n[bold cyan]System Health Check:[/bold cyan]")
-            
             health_table = Table()
             health_table.add_column("Component", style="cyan")
             health_table.add_column("Status", style="green")
@@ -320,7 +394,7 @@ class PatentAgentDemo:
                 status_color = "green" if status == "healthy" else "yellow" if status == "degraded" else "red"
                 health_table.add_row(component, f"[{status_color}]{status}[/{status_color}]")
                 
-            console.print(health_table)
+            console.print(Group("\n[bold cyan]System Health Check:[/bold cyan]", health_table))
             
         except Exception as e:
             console.print(f"[red]Error performing health check: {e}[/red]")
@@ -337,8 +411,6 @@ class PatentAgentDemo:
                 console.print("[yellow]No active workflows.[/yellow]")
                 return
                 
-            console.print(f"\n[bold cyan]Active Workflows ({len(workflows)}):[/bold cyan]")
-            
             workflow_table = Table()
             workflow_table.add_column("Workflow ID", style="cyan")
             workflow_table.add_column("Topic", style="green")
@@ -353,7 +425,7 @@ class PatentAgentDemo:
                     workflow.get("progress", "N/A")
                 )
                 
-            console.print(workflow_table)
+            console.print(Group(f"\n[bold cyan]Active Workflows ({len(workflows)}):[/bold cyan]", workflow_table))
             
         except Exception as e:
             console.print(f"[red]Error getting active workflows: {e}[/red]")
@@ -361,12 +433,20 @@ class PatentAgentDemo:
     async def run(self, args):
         """Main run method"""
         try:
+            if args.batch and args.analyze_only:
+                # Analysis only needs the model client, not the agent system
+                await self.run_batch_analysis(args.batch, args.batch_api)
+                return
+                
             # Start the system
             await self.start()
             
             if args.interactive:
                 # Run interactive mode
                 await self.interactive_mode()
+            elif args.batch:
+                # Run every workflow in the batch file
+                await self.run_batch_workflows(args.batch)
             elif args.topic:
                 # Run single workflow
                 await self.run_demo_workflow()
@@ -381,7 +461,7 @@ class PatentAgentDemo:
                     
         except Exception as e:
             console.print(f"[red]Fatal error: {e}[/red]")
-            logger.error(f"Fatal error: {e}")
+            logger.error("Fatal error: %s", e)
         finally:
             # Cleanup
             await self.stop()
@@ -395,6 +475,9 @@ def main():
 Examples:
   python main.py --interactive          # Run interactive mode
   python main.py --topic "AI system"    # Run single workflow
+  python main.py --batch topics.json    # Run many workflows concurrently
+  python main.py --batch topics.json --analyze-only --batch-api
+                                        # Score topics through Gemini Batch Mode
   python main.py                        # Run system and wait
         """
     )
@@ -417,6 +500,24 @@ Examples:
         help="Patent description for demo workflow"
     )
     
+    parser.add_argument(
+        "--batch",
+        type=str,
+        help="JSON file with a list of {\"topic\", \"description\"} objects to develop concurrently"
+    )
+    
+    parser.add_argument(
+        "--analyze-only",
+        action="store_true",
+        help="With --batch, only score each topic's patentability instead of developing it"
+    )
+    
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="With --analyze-only, submit the analyses through Gemini Batch Mode"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -425,10 +526,19 @@ Examples:
     
     args = parser.parse_args()
     
+    if args.batch_api and not args.analyze_only:
+        parser.error("--batch-api requires --batch and --analyze-only")
+    if args.analyze_only and not args.batch:
+        parser.error("--analyze-only requires --batch")
+        
     # Set logging level
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
         
+    # Prefer the libuv-based event loop when it is installed
+    if uvloop is not None:
+        uvloop.install()
+        
     # Create and run demo
     demo = PatentAgentDemo()
     
@@ -5,16 +5,18 @@ Manages all agents and provides the main interface for patent development
 
 import asyncio
 import logging
+import os
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 import time
-import uuid
 
 from .fastmcp_config import fastmcp_config, MessageType
+from .google_a2a_client import get_google_a2a_client, close_google_a2a_client
 from .agents import (
     PlannerAgent, SearcherAgent, DiscusserAgent, 
     WriterAgent, ReviewerAgent, RewriterAgent, CoordinatorAgent
 )
+from .agents.coordinator_agent import DEFAULT_PATENT_SUMMARY
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +36,12 @@ class PatentAgentSystem:
     def __init__(self):
         self.agents: Dict[str, Any] = {}
         self.coordinator: Optional[CoordinatorAgent] = None
-        self.system_start_time = time.time()
+        self.system_start_time = time.monotonic()
         self.is_running = False
         
+        # Upper bound on workflows developed concurrently by develop_patents
+        self.max_parallel_workflows = int(os.getenv("PATENT_MAX_PARALLEL_WORKFLOWS", "4"))
+        
         # Initialize FastMCP
         self.fastmcp_config = fastmcp_config
         
@@ -50,6 +55,10 @@ class PatentAgentSystem:
             # Initialize FastMCP
             await self.fastmcp_config.initialize()
             
+            # Warm the AI client so the first workflow does not pay connection setup
+            client = await get_google_a2a_client()
+            await client.warmup()
+            
             # Create and start all agents
             await self._create_agents()
             await self._start_agents()
@@ -58,7 +67,7 @@ class PatentAgentSystem:
             logger.info("Patent Agent System started successfully")
             
         except Exception as e:
-            logger.error(f"Failed to start Patent Agent System: {e}")
+            logger.error("Failed to start Patent Agent System: %s", e)
             raise
             
     async def stop(self):
@@ -73,11 +82,14 @@ class PatentAgentSystem:
             # Stop FastMCP
             await self.fastmcp_config.shutdown()
             
+            # Release pooled HTTP connections
+            await close_google_a2a_client()
+            
             self.is_running = False
             logger.info("Patent Agent System stopped successfully")
             
         except Exception as e:
-            logger.error(f"Error stopping Patent Agent System: {e}")
+            logger.error("Error stopping Patent Agent System: %s", e)
             
     async def _create_agents(self):
         """Create all agents"""
@@ -94,10 +106,10 @@ class PatentAgentSystem:
             self.coordinator = CoordinatorAgent()
             self.agents["coordinator_agent"] = self.coordinator
             
-            logger.info(f"Created {len(self.agents)} agents")
+            logger.info("Created %s agents", len(self.agents))
             
         except Exception as e:
-            logger.error(f"Error creating agents: {e}")
+            logger.error("Error creating agents: %s", e)
             raise
             
     async def _start_agents(self):
@@ -110,7 +122,7 @@ class PatentAgentSystem:
             logger.info("All agents started successfully")
             
         except Exception as e:
-            logger.error(f"Error starting agents: {e}")
+            logger.error("Error starting agents: %s", e)
             raise
             
     async def develop_patent(self, topic: str, description: str, 
@@ -123,7 +135,7 @@ class PatentAgentSystem:
             if not topic or not description:
                 raise ValueError("Topic and description are required")
                 
-            logger.info(f"Starting patent development for: {topic}")
+            logger.info("Starting patent development for: %s", topic)
             
             # Send task to coordinator to start workflow
             result = await self.coordinator.execute_task({
@@ -145,28 +157,52 @@ class PatentAgentSystem:
             return final_result
             
         except Exception as e:
-            logger.error(f"Error developing patent: {e}")
+            logger.error("Error developing patent: %s", e)
             raise
             
+    async def develop_patents(self, items: List[Dict[str, str]],
+                            workflow_type: str = "standard") -> List[Dict[str, Any]]:
+        """Develop several patents concurrently, preserving input order
+
+        Each item needs "topic" and "description". A failed workflow yields an
+        error entry instead of cancelling the others.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_workflows)
+        
+        async def develop(item: Dict[str, str]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.develop_patent(item.get("topic"), item.get("description"), workflow_type)
+                except Exception as e:
+                    return {"topic": item.get("topic"), "status": "error", "error": str(e)}
+                    
+        return await asyncio.gather(*(develop(item) for item in items))
+        
     async def _wait_for_workflow_completion(self, workflow_id: str) -> Dict[str, Any]:
         """Wait for a workflow to complete and return results"""
         try:
             max_wait_time = 300  # 5 minutes max wait
-            start_time = time.time()
+            start_time = time.monotonic()
             
-            while time.time() - start_time < max_wait_time:
+            while time.monotonic() - start_time < max_wait_time:
                 # Check workflow status
                 status_result = await self.coordinator.execute_task({
                     "type": "monitor_workflow",
                     "workflow_id": workflow_id
                 })
                 
-                if status_result.success:
-                    workflow_data = status_result.data.get("workflow")
-                    if workflow_data and workflow_data.get("overall_status") == "completed":
-                        # Workflow completed, get final results
-                        return await self._get_workflow_results(workflow_id)
-                        
+                # Finished workflows leave active_workflows, so the coordinator
+                # reports them by status rather than by PatentWorkflow object
+                if status_result.success and status_result.data.get("overall_status") == "completed":
+                    # Workflow completed, get final results
+                    return await self._get_workflow_results(workflow_id)
+                    
+                # A stage that failed its retry has been escalated; waiting longer won't help
+                if status_result.success and status_result.data.get("overall_status") == "error":
+                    raise RuntimeError(
+                        f"Workflow {workflow_id} failed: {status_result.data.get('error') or 'unknown error'}"
+                    )
+                    
                 # Wait before checking again
                 await asyncio.sleep(2)
                 
@@ -174,28 +210,28 @@ class PatentAgentSystem:
             raise TimeoutError(f"Workflow {workflow_id} did not complete within {max_wait_time} seconds")
             
         except Exception as e:
-            logger.error(f"Error waiting for workflow completion: {e}")
+            logger.error("Error waiting for workflow completion: %s", e)
             raise
             
     async def _get_workflow_results(self, workflow_id: str) -> Dict[str, Any]:
         """Get final results from a completed workflow"""
         try:
-            # This would typically involve querying the coordinator for final results
-            # For now, we'll return a mock result structure
+            final_results = self.coordinator.completed_workflows.pop(workflow_id, {})
+            patent_summary = final_results.get("patent_summary")
+            if patent_summary is None:
+                logger.warning("No patent summary recorded for workflow %s; returning the placeholder",
+                               workflow_id)
+                patent_summary = dict(DEFAULT_PATENT_SUMMARY)
             return {
                 "workflow_id": workflow_id,
                 "status": "completed",
-                "patent_summary": {
-                    "title": "Generated Patent Title",
-                    "status": "Ready for Filing",
-                    "confidence_score": 0.92
-                },
+                "patent_summary": patent_summary,
                 "completion_time": time.time(),
                 "message": "Patent development workflow completed successfully"
             }
             
         except Exception as e:
-            logger.error(f"Error getting workflow results: {e}")
+            logger.error("Error getting workflow results: %s", e)
             raise
             
     async def get_system_status(self) -> SystemStatus:
@@ -220,7 +256,7 @@ class PatentAgentSystem:
                 system_health = "unhealthy"
                 
             # Calculate uptime
-            uptime = time.time() - self.system_start_time
+            uptime = time.monotonic() - self.system_start_time
             
             # Compile performance metrics
             performance_metrics = {
@@ -239,7 +275,7 @@ class PatentAgentSystem:
                         "average_execution_time": agent_status.get("performance_metrics", {}).get("average_execution_time", 0)
                     }
                 except Exception as e:
-                    logger.warning(f"Could not get status for agent {agent_name}: {e}")
+                    logger.warning("Could not get status for agent %s: %s", agent_name, e)
                     
             return SystemStatus(
                 total_agents=total_agents,
@@ -251,7 +287,7 @@ class PatentAgentSystem:
             )
             
         except Exception as e:
-            logger.error(f"Error getting system status: {e}")
+            logger.error("Error getting system status: %s", e)
             raise
             
     async def monitor_workflows(self) -> List[Dict[str, Any]]:
@@ -267,11 +303,11 @@ class PatentAgentSystem:
             if result.success:
                 return result.data.get("active_workflows", [])
             else:
-                logger.error(f"Failed to monitor workflows: {result.error_message}")
+                logger.error("Failed to monitor workflows: %s", result.error_message)
                 return []
                 
         except Exception as e:
-            logger.error(f"Error monitoring workflows: {e}")
+            logger.error("Error monitoring workflows: %s", e)
             return []
             
     async def get_agent_status(self, agent_name: str) -> Optional[Dict[str, Any]]:
@@ -281,11 +317,11 @@ class PatentAgentSystem:
             if agent:
                 return await agent.get_status()
             else:
-                logger.warning(f"Agent {agent_name} not found")
+                logger.warning("Agent %s not found", agent_name)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting agent status: {e}")
+            logger.error("Error getting agent status: %s", e)
             return None
             
     async def send_agent_message(self, agent_name: str, message_type: MessageType, 
@@ -296,10 +332,10 @@ class PatentAgentSystem:
             if agent:
                 await agent.send_message(agent_name, message_type, content, priority)
             else:
-                logger.warning(f"Agent {agent_name} not found")
+                logger.warning("Agent %s not found", agent_name)
                 
         except Exception as e:
-            logger.error(f"Error sending message to agent: {e}")
+            logger.error("Error sending message to agent: %s", e)
             
     async def broadcast_system_message(self, message_type: MessageType, 
                                     content: Dict[str, Any], priority: int = 1):
@@ -309,7 +345,7 @@ class PatentAgentSystem:
                 message_type, content, "system", priority
             )
         except Exception as e:
-            logger.error(f"Error broadcasting system message: {e}")
+            logger.error("Error broadcasting system message: %s", e)
             
     async def health_check(self) -> Dict[str, Any]:
         """Perform a comprehensive health check of the system"""
@@ -364,7 +400,7 @@ class PatentAgentSystem:
             return health_status
             
         except Exception as e:
-            logger.error(f"Error performing health check: {e}")
+            logger.error("Error performing health check: %s", e)
             return {
                 "system": "error",
                 "error": str(e),
@@ -376,10 +412,10 @@ class PatentAgentSystem:
         try:
             agent = self.agents.get(agent_name)
             if not agent:
-                logger.warning(f"Agent {agent_name} not found")
+                logger.warning("Agent %s not found", agent_name)
                 return False
                 
-            logger.info(f"Restarting agent {agent_name}")
+            logger.info("Restarting agent %s", agent_name)
             
             # Stop agent
             await agent.stop()
@@ -390,11 +426,11 @@ class PatentAgentSystem:
             # Start agent
             await agent.start()
             
-            logger.info(f"Agent {agent_name} restarted successfully")
+            logger.info("Agent %s restarted successfully", agent_name)
             return True
             
         except Exception as e:
-            logger.error(f"Error restarting agent {agent_name}: {e}")
+            logger.error("Error restarting agent %s: %s", agent_name, e)
             return False
             
     async def emergency_shutdown(self):
@@ -409,11 +445,14 @@ class PatentAgentSystem:
             # Stop FastMCP
             await self.fastmcp_config.shutdown()
             
+            # Release pooled HTTP connections
+            await close_google_a2a_client()
+            
             self.is_running = False
             logger.critical("Emergency shutdown completed")
             
         except Exception as e:
-            logger.critical(f"Error during emergency shutdown: {e}")
+            logger.critical("Error during emergency shutdown: %s", e)
             
     def __enter__(self):
         """Context manager entry"""
@@ -0,0 +1,102 @@
+"""
+Tests for the Coordinator Agent's workflow results
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# The package uses relative imports, so it is imported from its parent directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+try:
+    from patent_agent_demo.agents.coordinator_agent import CoordinatorAgent, DEFAULT_PATENT_SUMMARY
+    from patent_agent_demo.agents.reviewer_agent import ReviewResult
+    from patent_agent_demo.agents.searcher_agent import SearchQuery, SearchReport
+    from patent_agent_demo.google_a2a_client import PatentAnalysis, PatentDraft, SearchResult
+except ImportError:  # google-generativeai / aiohttp not installed
+    CoordinatorAgent = None
+
+@unittest.skipIf(CoordinatorAgent is None, "agent dependencies are not installed")
+class PatentSummaryTest(unittest.TestCase):
+    """The summary must carry what the agents produced, not placeholders"""
+
+    def _stage_results(self):
+        """Stage results shaped like the TaskResult.data each agent returns"""
+        analysis = PatentAnalysis(
+            novelty_score=9.0,
+            inventive_step_score=8.2,
+            industrial_applicability=True,
+            prior_art_analysis=[],
+            claim_analysis={},
+            technical_merit={},
+            commercial_potential="High",
+            patentability_assessment="Strong",
+            recommendations=["File quickly"]
+        )
+        prior_art = SearchResult(
+            patent_id="US1234567",
+            title="Earlier Widget",
+            abstract="An earlier widget",
+            inventors=["A. Inventor"],
+            filing_date="2020-01-01",
+            publication_date="2021-01-01",
+            relevance_score=0.7,
+            similarity_analysis={}
+        )
+        search_report = SearchReport(
+            query=SearchQuery(
+                topic="Widget", keywords=["widget"], date_range="", jurisdiction="US",
+                max_results=10, search_filters={}
+            ),
+            results=[prior_art],
+            analysis={},
+            recommendations=[],
+            risk_assessment={},
+            novelty_score=7.0
+        )
+        patent_draft = PatentDraft(
+            title="Real Title",
+            abstract="",
+            background="",
+            summary="",
+            detailed_description="",
+            claims=["1. A widget comprising a sprocket."],
+            drawings_description="",
+            technical_diagrams=[]
+        )
+        review_result = ReviewResult(
+            task_id="review_1",
+            overall_score=8.0,
+            section_scores={},
+            issues_found=[],
+            recommendations=["Narrow claim 1"],
+            compliance_status="compliant",
+            quality_assessment="Good"
+        )
+        return {
+            "stage_0": {"strategy": None, "analysis": analysis, "recommendations": analysis.recommendations},
+            "stage_1": {"search_report": search_report, "prior_art_count": 1},
+            "stage_3": {"patent_draft": patent_draft, "writing_output": None},
+            "stage_4": {"review_result": review_result, "feedback": {}}
+        }
+
+    def test_summary_uses_stage_results(self):
+        summary = asyncio.run(CoordinatorAgent()._generate_patent_summary(self._stage_results()))
+
+        self.assertEqual(summary["title"], "Real Title")
+        self.assertEqual(summary["key_claims"], ["1. A widget comprising a sprocket."])
+        self.assertEqual(summary["novelty_score"], 9.0)
+        self.assertEqual(summary["inventive_step"], 8.2)
+        self.assertEqual(summary["recommendations"], ["Narrow claim 1"])
+        self.assertEqual([p["patent_id"] for p in summary["prior_art_analysis"]], ["US1234567"])
+
+    def test_summary_falls_back_without_stage_results(self):
+        summary = asyncio.run(CoordinatorAgent()._generate_patent_summary({}))
+
+        self.assertEqual(summary["title"], DEFAULT_PATENT_SUMMARY["title"])
+        self.assertEqual(summary["key_claims"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the agents' task dispatch tables
+"""
+
+import asyncio
+import importlib
+import inspect
+import sys
+import unittest
+from pathlib import Path
+
+# The package uses relative imports, so it is imported from its parent directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+try:
+    from patent_agent_demo.agents.base_agent import TaskResult
+    from patent_agent_demo.agents import (
+        PlannerAgent, SearcherAgent, DiscusserAgent,
+        WriterAgent, ReviewerAgent, RewriterAgent, CoordinatorAgent
+    )
+    AGENT_CLASSES = (
+        PlannerAgent, SearcherAgent, DiscusserAgent,
+        WriterAgent, ReviewerAgent, RewriterAgent, CoordinatorAgent
+    )
+except ImportError:  # google-generativeai / aiohttp not installed
+    AGENT_CLASSES = ()
+
+@unittest.skipIf(not AGENT_CLASSES, "agent dependencies are not installed")
+class TaskHandlersTest(unittest.TestCase):
+    """Every task type an agent dispatches must reach a handler returning a TaskResult"""
+
+    def test_handlers_are_agent_coroutines(self):
+        for agent_class in AGENT_CLASSES:
+            table = importlib.import_module(agent_class.__module__).TASK_HANDLERS
+            for task_type, handler in table.items():
+                with self.subTest(agent=agent_class.__name__, task_type=task_type):
+                    self.assertIs(getattr(agent_class, handler.__name__), handler)
+                    self.assertTrue(inspect.iscoroutinefunction(handler))
+
+    def test_every_task_type_returns_task_result(self):
+        async def run_all():
+            for agent_class in AGENT_CLASSES:
+                agent = agent_class()
+                table = importlib.import_module(agent_class.__module__).TASK_HANDLERS
+                for task_type in table:
+                    with self.subTest(agent=agent.name, task_type=task_type):
+                        # The agents are not started, so handlers that need the
+                        # model client fail; they must still report a TaskResult
+                        result = await asyncio.wait_for(agent.execute_task({"type": task_type}), 30)
+                        self.assertIsInstance(result, TaskResult)
+
+        asyncio.run(run_all())
+
+    def test_unknown_task_type_fails(self):
+        result = asyncio.run(PlannerAgent().execute_task({"type": "no_such_task"}))
+
+        self.assertFalse(result.success)
+        self.assertIn("no_such_task", result.error_message)
+
+if __name__ == "__main__":
+    unittest.main()